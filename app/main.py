@@ -504,8 +504,9 @@ def show_overview_page():
     
     with col4:
         total_savings = sum(
-            e.current_balance for e in st.session_state.budget_profile.envelopes 
-            if e.category in [EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING]
+            e.current_balance for e in st.session_state.budget_profile.get_envelopes_by_category(
+                EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING
+            )
         )
         st.metric("Total Savings", f"${total_savings:,.2f}")
     
@@ -638,7 +639,7 @@ def show_bills_calendar_page():
                 paid=False
             )
             
-            st.session_state.budget_profile.bills.append(new_bill)
+            st.session_state.budget_profile.add_bill(new_bill)
             st.success(f"Added bill: {name} for ${amount:,.2f} due {due_date}")
             
             # Save to Supabase if available
@@ -716,8 +717,8 @@ def show_reports_page():
         st.subheader("Budget Summary")
         
         total_bills = sum(b.amount for b in st.session_state.budget_profile.bills if not b.paid)
-        total_savings = sum(e.current_balance for e in st.session_state.budget_profile.envelopes 
-                          if e.category in [EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING])
+        total_savings = sum(e.current_balance for e in st.session_state.budget_profile.get_envelopes_by_category(
+                          EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING))
         
         col1, col2 = st.columns(2)
         with col1:
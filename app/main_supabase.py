@@ -22,6 +22,9 @@ from budget.models import (
 )
 from budget.allocator import PaycheckAllocator, CashflowForecaster
 from app.utils import calculate_next_payday, calculate_paycheque_windows, assign_bills_to_windows, format_currency, format_date, get_pay_schedule_options
+from db.records import (
+    EnvelopeRecord, BillRecord, DebtRecord, SinkingFundRecord, SavingsGoalRecord, to_records
+)
 
 # Import Supabase client
 try:
@@ -149,29 +152,15 @@ def load_supabase_data():
         # For now, we'll just test the connection
         # In a real implementation, you would load user-specific data here
         if st.session_state.current_profile_id:
-            # Load envelopes
-            envelopes = supabase_client.get_envelopes(st.session_state.current_profile_id)
-            st.session_state.supabase_data['envelopes'] = envelopes
-            
-            # Load bills
-            bills = supabase_client.get_bills(st.session_state.current_profile_id, paid=False)
-            st.session_state.supabase_data['bills'] = bills
-            
-            # Load debts
-            debts = supabase_client.get_debts(st.session_state.current_profile_id, paid_off=False)
-            st.session_state.supabase_data['debts'] = debts
-            
-            # Load sinking funds
-            sinking_funds = supabase_client.get_sinking_funds(st.session_state.current_profile_id)
-            st.session_state.supabase_data['sinking_funds'] = sinking_funds
-            
-            # Load savings goals
-            savings_goals = supabase_client.get_savings_goals(st.session_state.current_profile_id)
-            st.session_state.supabase_data['savings_goals'] = savings_goals
-            
-            # Load settings
-            settings = supabase_client.get_budget_settings(st.session_state.current_profile_id)
-            st.session_state.supabase_data['settings'] = settings
+            # Load the profile and everything under it in one round trip
+            bundle = supabase_client.get_profile_bundle(st.session_state.current_profile_id)
+            if bundle:
+                st.session_state.supabase_data['envelopes'] = to_records(EnvelopeRecord, bundle["envelopes"])
+                st.session_state.supabase_data['bills'] = to_records(BillRecord, bundle["bills"])
+                st.session_state.supabase_data['debts'] = to_records(DebtRecord, bundle["debts"])
+                st.session_state.supabase_data['sinking_funds'] = to_records(SinkingFundRecord, bundle["sinking_funds"])
+                st.session_state.supabase_data['savings_goals'] = to_records(SavingsGoalRecord, bundle["savings_goals"])
+                st.session_state.supabase_data['settings'] = bundle["budget_settings"]
             
     except Exception as e:
         st.error(f"Error loading data from Supabase: {str(e)}")
@@ -345,8 +334,9 @@ def show_overview_page():
     
     with col4:
         total_savings = sum(
-            e.current_balance for e in st.session_state.budget_profile.envelopes 
-            if e.category in [EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING]
+            e.current_balance for e in st.session_state.budget_profile.get_envelopes_by_category(
+                EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING
+            )
         )
         st.metric("Total Savings", f"${total_savings:,.2f}")
     
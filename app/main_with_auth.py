@@ -437,8 +437,9 @@ def show_overview_page():
     
     with col4:
         total_savings = sum(
-            e.current_balance for e in st.session_state.budget_profile.envelopes 
-            if e.category in [EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING]
+            e.current_balance for e in st.session_state.budget_profile.get_envelopes_by_category(
+                EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING
+            )
         )
         st.metric("Total Savings", f"${total_savings:,.2f}")
     
@@ -1,7 +1,9 @@
 """
 Paycheck allocation engine for budgeting.
 """
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, DefaultDict, Optional, Tuple, Any
+from collections import defaultdict
+from functools import lru_cache
 from datetime import date, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 import math
@@ -12,6 +14,14 @@ from .models import (
 )
 
 
+@lru_cache(maxsize=4096)
+def _round_to_nearest(amount: float, nearest: float) -> float:
+    """Round amount to nearest specified value (memoized; fixed bills and debt minimums recur)."""
+    if nearest == 0:
+        return amount
+    return round(amount / nearest) * nearest
+
+
 class PaycheckAllocator:
     """Allocates paycheck funds to envelopes based on priority rules."""
     
@@ -19,6 +29,36 @@ class PaycheckAllocator:
         self.profile = profile
         self.settings = profile.settings
     
+    def _envelope_lookups(self) -> Tuple[Dict[str, Envelope], List[Tuple[str, float]], Optional[str]]:
+        """
+        Build the envelope-dependent parts of one allocation.
+        
+        Rebuilt for every paycheck so in-place edits to envelopes are always
+        seen; it is one pass over the envelopes, cheap next to the sweep.
+        
+        Returns:
+            Tuple of (envelope by ID, savings/investing (envelope_id, share)
+            pairs, first discretionary envelope ID or None)
+        """
+        envelopes = self.profile.envelopes
+        
+        envelope_by_id: Dict[str, Envelope] = {}
+        for envelope in envelopes:
+            envelope_by_id.setdefault(envelope.id, envelope)  # First match wins, as in get_envelope
+        
+        savings_envelopes = self.profile.get_envelopes_by_category(
+            EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING
+        )
+        total_target = sum(e.target_amount for e in savings_envelopes)
+        savings_shares = [
+            (e.id, e.target_amount / total_target) for e in savings_envelopes
+        ] if total_target > 0 else []
+        
+        discretionary = self.profile.get_envelopes_by_category(EnvelopeCategory.DISCRETIONARY)
+        discretionary_id = discretionary[0].id if discretionary else None
+        
+        return envelope_by_id, savings_shares, discretionary_id
+    
     def allocate_paycheck(self, net_amount: float, paycheck_date: date) -> PaycheckAllocation:
         """
         Allocate a paycheck to envelopes based on priority rules.
@@ -45,154 +85,118 @@ class PaycheckAllocator:
             remaining_amount=net_amount
         )
         
-        # Calculate next payday based on typical pay schedule
-        # (In real implementation, this would come from user profile)
-        next_payday = self._calculate_next_payday(paycheck_date)
+        envelope_by_id, savings_shares, discretionary_id = self._envelope_lookups()
         
         # Step 1: Ensure minimum buffer (skip for now - handled in cashflow forecast)
         
-        # Step 2: Fund bills due before next payday
-        bills = self.profile.get_bills_due_before(next_payday)
-        bills.sort(key=lambda b: b.due_date)  # Pay earliest bills first
+        # Steps 2-5 are collected up front into one priority-ordered list of
+        # (envelope_id, amount) needs and funded in a single sweep
+        debts = self.profile.get_active_debts()
+        needs = self._collect_needs(net_amount, paycheck_date, debts, envelope_by_id, savings_shares)
+        
+        # Accumulate into a local defaultdict and hand a plain dict to the
+        # model once, instead of a get/store pair on the model per update
+        allocations: DefaultDict[str, float] = defaultdict(float)
+        remaining = net_amount
+        for envelope_id, amount in needs:
+            if remaining <= 0:
+                break
+            if amount <= remaining:
+                allocations[envelope_id] += amount
+                remaining -= amount
+            else:
+                # Can't fully fund - allocate what we can
+                allocations[envelope_id] += remaining
+                remaining = 0
         
-        for bill in bills:
-            envelope = self.profile.get_envelope(bill.envelope_id)
-            if not envelope:
-                continue
+        # Step 6: Remaining goes to extra debt or discretionary
+        if remaining > 0:
+            # Apply debt strategy for extra payments. Only the top debt is
+            # funded, so a linear max/min scan replaces a full sort; both keep
+            # the earliest debt on ties, as the stable sort did
+            payable = [d for d in debts if d.envelope_id in envelope_by_id]
+            if payable:
+                if self.settings.debt_strategy == DebtStrategy.AVALANCHE:
+                    debt = max(payable, key=lambda d: d.apr)  # Highest APR first
+                else:  # SNOWBALL
+                    debt = min(payable, key=lambda d: d.balance)  # Smallest balance first
                 
-            # Check if envelope has enough, otherwise allocate from paycheck
-            if envelope.current_balance >= bill.amount:
-                # Bill can be paid from envelope balance
-                continue
+                # Allocate remaining to this debt
+                allocations[debt.envelope_id] += remaining
+                remaining = 0
             
-            amount_needed = bill.amount - envelope.current_balance
-            if amount_needed <= allocation.remaining_amount:
-                # Allocate to envelope
-                allocation.allocations[bill.envelope_id] = allocation.allocations.get(bill.envelope_id, 0) + amount_needed
-                allocation.remaining_amount -= amount_needed
-            else:
-                # Can't fully fund - allocate what we can
-                allocation.allocations[bill.envelope_id] = allocation.allocations.get(bill.envelope_id, 0) + allocation.remaining_amount
-                allocation.remaining_amount = 0
-                break
+            # If still remaining after debt, put in first discretionary envelope
+            if remaining > 0 and discretionary_id is not None:
+                allocations[discretionary_id] += remaining
+                remaining = 0
         
-        if allocation.remaining_amount <= 0:
-            return self._finalize_allocation(allocation)
+        allocation.allocations = dict(allocations)
+        allocation.remaining_amount = remaining
+        return self._finalize_allocation(allocation)
+    
+    def _collect_needs(
+        self, net_amount: float, paycheck_date: date, debts: List[Debt],
+        envelope_by_id: Dict[str, Envelope], savings_shares: List[Tuple[str, float]]
+    ) -> List[Tuple[str, float]]:
+        """
+        Build the priority-ordered funding needs for steps 2-5.
         
-        # Step 3: Fund minimum debt payments
-        debts = self.profile.get_active_debts()
-        for debt in debts:
-            envelope = self.profile.get_envelope(debt.envelope_id)
-            if not envelope:
-                continue
-            
-            # Check if envelope has enough for minimum payment
-            if envelope.current_balance >= debt.minimum_payment:
-                continue
+        Envelope balances are not touched while allocating, so every need can
+        be computed before any money is handed out.
+        
+        Args:
+            net_amount: Net paycheck amount after taxes
+            paycheck_date: Date paycheck is received
+            debts: Active debts, in profile order
+            envelope_by_id: Envelopes by ID, from _envelope_lookups
+            savings_shares: (envelope_id, share) savings split, from _envelope_lookups
             
-            amount_needed = debt.minimum_payment - envelope.current_balance
-            if amount_needed <= allocation.remaining_amount:
-                allocation.allocations[debt.envelope_id] = allocation.allocations.get(debt.envelope_id, 0) + amount_needed
-                allocation.remaining_amount -= amount_needed
-            else:
-                allocation.allocations[debt.envelope_id] = allocation.allocations.get(debt.envelope_id, 0) + allocation.remaining_amount
-                allocation.remaining_amount = 0
-                break
+        Returns:
+            List of (envelope_id, amount) tuples in funding order
+        """
+        needs: List[Tuple[str, float]] = []
         
-        if allocation.remaining_amount <= 0:
-            return self._finalize_allocation(allocation)
+        # Calculate next payday based on typical pay schedule
+        # (In real implementation, this would come from user profile)
+        next_payday = self._calculate_next_payday(paycheck_date)
         
-        # Step 4: Fund sinking funds by urgency
-        sinking_funds = self.profile.get_urgent_sinking_funds()
-        sinking_funds.sort(key=lambda sf: sf.months_remaining)  # Most urgent first
+        # Step 2: Fund bills due before next payday, earliest first
+        for bill in self.profile.get_bills_due_before(next_payday):
+            envelope = envelope_by_id.get(bill.envelope_id)
+            # Skip bills that can be paid from the envelope balance
+            if envelope and envelope.current_balance < bill.amount:
+                needs.append((bill.envelope_id, bill.amount - envelope.current_balance))
         
-        for sf in sinking_funds:
-            envelope = self.profile.get_envelope(sf.envelope_id)
-            if not envelope:
+        # Step 3: Fund minimum debt payments
+        for debt in debts:
+            envelope = envelope_by_id.get(debt.envelope_id)
+            if envelope and envelope.current_balance < debt.minimum_payment:
+                needs.append((debt.envelope_id, debt.minimum_payment - envelope.current_balance))
+        
+        # Step 4: Fund sinking funds by urgency
+        today = date.today()
+        for sf in self.profile.get_urgent_sinking_funds(today):  # Most urgent first
+            if sf.envelope_id not in envelope_by_id:
                 continue
             
-            recommended = sf.recommended_contribution
+            recommended = sf.recommended_contribution_as_of(today)
             if recommended <= 0:
                 continue
             
             # Cap at monthly contribution if set
             if sf.monthly_contribution:
                 recommended = min(recommended, sf.monthly_contribution)
-            
-            if recommended <= allocation.remaining_amount:
-                allocation.allocations[sf.envelope_id] = allocation.allocations.get(sf.envelope_id, 0) + recommended
-                allocation.remaining_amount -= recommended
-            else:
-                allocation.allocations[sf.envelope_id] = allocation.allocations.get(sf.envelope_id, 0) + allocation.remaining_amount
-                allocation.remaining_amount = 0
-                break
-        
-        if allocation.remaining_amount <= 0:
-            return self._finalize_allocation(allocation)
+            needs.append((sf.envelope_id, recommended))
         
         # Step 5: Fund savings/investing per strategy
-        savings_rate = self.settings.savings_rate
-        savings_amount = net_amount * savings_rate
+        savings_amount = net_amount * self.settings.savings_rate
         
         if savings_amount > 0:
-            # Find savings/investing envelopes
-            savings_envelopes = [
-                e for e in self.profile.envelopes
-                if e.category in [EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING]
-            ]
-            
-            if savings_envelopes:
-                # Distribute proportionally based on target amounts
-                total_target = sum(e.target_amount for e in savings_envelopes)
-                if total_target > 0:
-                    for envelope in savings_envelopes:
-                        proportion = envelope.target_amount / total_target
-                        amount = savings_amount * proportion
-                        if amount <= allocation.remaining_amount:
-                            allocation.allocations[envelope.id] = allocation.allocations.get(envelope.id, 0) + amount
-                            allocation.remaining_amount -= amount
-                        else:
-                            allocation.allocations[envelope.id] = allocation.allocations.get(envelope.id, 0) + allocation.remaining_amount
-                            allocation.remaining_amount = 0
-                            break
-        
-        if allocation.remaining_amount <= 0:
-            return self._finalize_allocation(allocation)
+            # Distribute proportionally based on target amounts
+            for envelope_id, proportion in savings_shares:
+                needs.append((envelope_id, savings_amount * proportion))
         
-        # Step 6: Remaining goes to extra debt or discretionary
-        if allocation.remaining_amount > 0:
-            # Apply debt strategy for extra payments
-            if self.settings.debt_strategy == DebtStrategy.AVALANCHE:
-                debts.sort(key=lambda d: d.apr, reverse=True)  # Highest APR first
-            else:  # SNOWBALL
-                debts.sort(key=lambda d: d.balance)  # Smallest balance first
-            
-            for debt in debts:
-                if allocation.remaining_amount <= 0:
-                    break
-                
-                envelope = self.profile.get_envelope(debt.envelope_id)
-                if not envelope:
-                    continue
-                
-                # Allocate remaining to this debt
-                allocation.allocations[debt.envelope_id] = allocation.allocations.get(debt.envelope_id, 0) + allocation.remaining_amount
-                allocation.remaining_amount = 0
-                break
-            
-            # If still remaining after debt, put in discretionary
-            if allocation.remaining_amount > 0:
-                discretionary_envelopes = [
-                    e for e in self.profile.envelopes
-                    if e.category == EnvelopeCategory.DISCRETIONARY
-                ]
-                if discretionary_envelopes:
-                    # Put in first discretionary envelope
-                    envelope = discretionary_envelopes[0]
-                    allocation.allocations[envelope.id] = allocation.allocations.get(envelope.id, 0) + allocation.remaining_amount
-                    allocation.remaining_amount = 0
-        
-        return self._finalize_allocation(allocation)
+        return needs
     
     def _calculate_next_payday(self, current_payday: date) -> date:
         """
@@ -210,7 +214,7 @@ class PaycheckAllocator:
             total_rounded = 0.0
             
             for envelope_id, amount in allocation.allocations.items():
-                rounded = self._round_to_nearest(amount, round_to)
+                rounded = _round_to_nearest(amount, round_to)
                 rounded_allocations[envelope_id] = rounded
                 total_rounded += rounded
             
@@ -236,12 +240,6 @@ class PaycheckAllocator:
             allocation.remaining_amount = 0
         
         return allocation
-    
-    def _round_to_nearest(self, amount: float, nearest: float) -> float:
-        """Round amount to nearest specified value."""
-        if nearest == 0:
-            return amount
-        return round(amount / nearest) * nearest
 
 
 class CashflowForecaster:
@@ -277,26 +275,35 @@ class CashflowForecaster:
         
         # Initialize with starting balance
         current_balance = starting_balance
-        current_date = start_date
         
-        # Create dictionary of paycheck allocations by date
-        paycheck_by_date = {alloc.date: alloc for alloc in paycheck_allocations}
+        # Days are walked as date ordinals so per-day lookups compare ints
+        # rather than date objects
+        paycheck_by_day = {alloc.date.toordinal(): alloc for alloc in paycheck_allocations}
         
-        # Create list of bills sorted by due date
-        bills = [bill for bill in self.profile.bills if not bill.paid]
-        bills.sort(key=lambda b: b.due_date)
+        # Bucket the unpaid bills inside the forecast window by due day so
+        # each day costs one dict lookup instead of a scan over every bill
+        bills_by_day: DefaultDict[int, List[Bill]] = defaultdict(list)
+        for bill in self.profile.get_bills_due_between(start_date, end_date):
+            bills_by_day[bill.due_date.toordinal()].append(bill)
         
         # Track envelope balances (simplified - in reality would update as we go)
-        envelope_balances = {
-            envelope.id: envelope.current_balance
-            for envelope in self.profile.envelopes
-        }
+        envelope_balances = self.profile.envelope_balance_snapshot()
+        
+        checking_buffer = self.profile.settings.checking_buffer
+        
+        # Daily balances go into a preallocated list and are paired with the
+        # day's dates in one pass at the end, instead of a model dict write per day
+        first_day = start_date.toordinal()
+        days = [date.fromordinal(day) for day in range(first_day, end_date.toordinal() + 1)]
+        daily_balances = [0.0] * len(days)
         
         # Process each day
-        while current_date <= end_date:
+        for i, current_date in enumerate(days):
+            day = first_day + i
+            
             # Add paycheck if received today
-            if current_date in paycheck_by_date:
-                paycheck = paycheck_by_date[current_date]
+            paycheck = paycheck_by_day.get(day)
+            if paycheck is not None:
                 current_balance += paycheck.net_amount
                 
                 # Update envelope balances with allocations
@@ -312,7 +319,7 @@ class CashflowForecaster:
                 })
             
             # Pay bills due today
-            today_bills = [b for b in bills if b.due_date == current_date]
+            today_bills = bills_by_day.get(day, ())
             for bill in today_bills:
                 envelope = self.profile.get_envelope(bill.envelope_id)
                 if not envelope:
@@ -339,23 +346,21 @@ class CashflowForecaster:
                     )
             
             # Record daily balance
-            forecast.daily_balances[current_date] = current_balance
+            daily_balances[i] = current_balance
             
             # Check for negative balance alert
-            if current_balance < self.profile.settings.checking_buffer:
+            if current_balance < checking_buffer:
                 forecast.alerts.append(
                     f"Low balance warning: ${current_balance:.2f} on {current_date} "
-                    f"(below buffer of ${self.profile.settings.checking_buffer:.2f})"
+                    f"(below buffer of ${checking_buffer:.2f})"
                 )
             
             if current_balance < 0:
                 forecast.alerts.append(
                     f"Negative balance: ${current_balance:.2f} on {current_date}"
                 )
-            
-            # Move to next day
-            current_date += timedelta(days=1)
         
+        forecast.daily_balances = dict(zip(days, daily_balances))
         return forecast
 
 
@@ -383,13 +388,13 @@ class ReconciliationEngine:
         """
         results = []
         
-        # Group actual transactions by envelope
-        actual_by_envelope: Dict[str, float] = {}
+        # Group actual transactions by envelope in a single pass
+        actual_by_envelope: DefaultDict[str, float] = defaultdict(float)
         for transaction in actual_transactions:
             envelope_id = transaction.get("envelope_id")
             amount = transaction.get("amount", 0)
             if envelope_id and amount != 0:
-                actual_by_envelope[envelope_id] = actual_by_envelope.get(envelope_id, 0) + amount
+                actual_by_envelope[envelope_id] += amount
         
         # Calculate planned amounts (from envelope targets and allocations)
         for envelope in profile.envelopes:
@@ -438,23 +443,35 @@ class ReconciliationEngine:
         Returns:
             Updated UserBudgetProfile
         """
-        # Create a copy of the profile
-        updated_profile = profile.copy()
+        # Shallow-copy the profile and its envelope list; only envelopes whose
+        # target changes are rebuilt, the rest stay shared with the source
+        updated_profile = profile.model_copy()
+        envelopes = list(profile.envelopes)
+        position_by_id: Dict[str, int] = {}
+        for i, envelope in enumerate(envelopes):
+            position_by_id.setdefault(envelope.id, i)  # First match wins, as in get_envelope
         
         for result in reconciliation_results:
-            envelope = updated_profile.get_envelope(result.envelope_id)
-            if not envelope:
+            position = position_by_id.get(result.envelope_id)
+            if position is None:
                 continue
+            envelope = envelopes[position]
+            target_amount = envelope.target_amount
             
             # Adjust target based on over/under spending
             if result.over_under == "over" and result.percentage > 110:
                 # Consistently over budget - increase target
                 adjustment = envelope.target_amount * adjustment_factor
-                envelope.target_amount += adjustment
+                target_amount += adjustment
             
             elif result.over_under == "under" and result.percentage < 90:
                 # Consistently under budget - decrease target
                 adjustment = envelope.target_amount * adjustment_factor
-                envelope.target_amount = max(0, envelope.target_amount - adjustment)
+                target_amount = max(0, envelope.target_amount - adjustment)
+            
+            if target_amount != envelope.target_amount:
+                envelopes[position] = envelope.model_copy(update={"target_amount": target_amount})
+        
+        updated_profile.envelopes = envelopes
         
         return updated_profile
\ No newline at end of file
@@ -1,11 +1,17 @@
 """
 Budget models for paycheck allocation and envelope system.
 """
-from typing import List, Dict, Optional, Any
+from typing import Annotated, List, Dict, Optional, Any, Tuple
+from bisect import bisect_left, bisect_right
+import sys
 from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
-from pydantic import BaseModel, Field, validator
+from pydantic import AfterValidator, BaseModel, Field, PrivateAttr, validator
+
+
+# Envelope IDs are interned so allocation dict lookups compare by identity
+EnvelopeId = Annotated[str, AfterValidator(sys.intern)]
 
 
 class EnvelopeCategory(str, Enum):
@@ -44,7 +50,7 @@ class DebtStrategy(str, Enum):
 
 class Envelope(BaseModel):
     """A budget envelope for allocating funds."""
-    id: Optional[str] = None
+    id: Optional[EnvelopeId] = None
     category: EnvelopeCategory
     name: str
     target_amount: float = Field(..., ge=0, description="Target amount for this envelope")
@@ -68,7 +74,7 @@ class Bill(BaseModel):
     name: str
     amount: float = Field(..., ge=0)
     bill_type: BillType
-    envelope_id: str = Field(..., description="ID of envelope to pay from")
+    envelope_id: EnvelopeId = Field(..., description="ID of envelope to pay from")
     due_date: date
     recurrence: Optional[Recurrence] = None
     paid: bool = Field(False)
@@ -84,7 +90,7 @@ class Debt(BaseModel):
     apr: float = Field(..., ge=0, le=1, description="Annual percentage rate (0.0 to 1.0)")
     minimum_payment: float = Field(..., ge=0)
     due_date: date
-    envelope_id: str = Field(..., description="ID of envelope for payments")
+    envelope_id: EnvelopeId = Field(..., description="ID of envelope for payments")
     strategy: DebtStrategy = Field(DebtStrategy.AVALANCHE)
     paid_off: bool = Field(False)
     metadata: Dict[str, Any] = Field(default_factory=dict)
@@ -98,13 +104,16 @@ class SinkingFund(BaseModel):
     current_balance: float = Field(0.0, ge=0)
     deadline: date
     monthly_contribution: Optional[float] = Field(None, ge=0)
-    envelope_id: str
+    envelope_id: EnvelopeId
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
     @property
     def months_remaining(self) -> int:
         """Calculate months remaining until deadline."""
-        today = date.today()
+        return self.months_remaining_as_of(date.today())
+    
+    def months_remaining_as_of(self, today: date) -> int:
+        """Calculate months remaining until deadline as seen from a given day."""
         if self.deadline <= today:
             return 0
         
@@ -115,7 +124,11 @@ class SinkingFund(BaseModel):
     @property
     def recommended_contribution(self) -> float:
         """Calculate recommended monthly contribution to meet target by deadline."""
-        months = self.months_remaining
+        return self.recommended_contribution_as_of(date.today())
+    
+    def recommended_contribution_as_of(self, today: date) -> float:
+        """Calculate recommended monthly contribution as seen from a given day."""
+        months = self.months_remaining_as_of(today)
         if months == 0:
             return self.target_amount - self.current_balance
         
@@ -134,7 +147,7 @@ class SavingsGoal(BaseModel):
     current_balance: float = Field(0.0, ge=0)
     target_date: Optional[date] = None
     monthly_contribution: float = Field(0.0, ge=0)
-    envelope_id: str
+    envelope_id: EnvelopeId
     investment_strategy: Optional[str] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
@@ -218,6 +231,90 @@ class UserBudgetProfile(BaseModel):
     last_reconciliation: Optional[date] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
+    # Unpaid bills sorted by due date, with a parallel list of due dates for
+    # bisect. Stored as (bills list indexed, due dates, sorted bills) and kept
+    # in sync by add_bill, remove_bill, mark_bill_paid and reschedule_bill;
+    # rebuilt if the bills list is replaced. Edit bills through those helpers.
+    _bill_index: Optional[Tuple[List[Bill], List[date], List[Bill]]] = PrivateAttr(default=None)
+    
+    def _unpaid_bills_by_due_date(self) -> Tuple[List[date], List[Bill]]:
+        """Get unpaid bills sorted by due date along with their due dates."""
+        index = self._bill_index
+        if index is None or index[0] is not self.bills:
+            unpaid = sorted((b for b in self.bills if not b.paid), key=lambda b: b.due_date)
+            index = (self.bills, [b.due_date for b in unpaid], unpaid)
+            self._bill_index = index
+        return index[1], index[2]
+    
+    def _unindex_bill(self, bill: Bill) -> None:
+        """Drop a bill from the unpaid index, if it is indexed."""
+        index = self._bill_index
+        if index is None or index[0] is not self.bills:
+            return
+        _, due_dates, sorted_bills = index
+        begin = bisect_left(due_dates, bill.due_date)
+        end = bisect_right(due_dates, bill.due_date)
+        for position in range(begin, end):
+            if sorted_bills[position] is bill:
+                del due_dates[position]
+                del sorted_bills[position]
+                return
+    
+    def get_bill(self, bill_id: str) -> Optional[Bill]:
+        """Get bill by ID."""
+        for bill in self.bills:
+            if bill.id == bill_id:
+                return bill
+        return None
+    
+    def add_bill(self, bill: Bill) -> None:
+        """Add a bill, keeping the due-date index in sync."""
+        index = self._bill_index
+        index_valid = index is not None and index[0] is self.bills
+        self.bills.append(bill)
+        
+        # The new bill is last in the list, so it goes after bills due the same day
+        if index_valid and not bill.paid:
+            _, due_dates, sorted_bills = index
+            position = bisect_right(due_dates, bill.due_date)
+            due_dates.insert(position, bill.due_date)
+            sorted_bills.insert(position, bill)
+    
+    def remove_bill(self, bill_id: str) -> Optional[Bill]:
+        """Remove a bill by ID, returning it if found."""
+        for i, bill in enumerate(self.bills):
+            if bill.id == bill_id:
+                self._unindex_bill(bill)
+                return self.bills.pop(i)
+        return None
+    
+    def mark_bill_paid(self, bill_id: str, paid_date: Optional[date] = None) -> Optional[Bill]:
+        """Mark a bill paid (today unless paid_date is given), returning it if found."""
+        bill = self.get_bill(bill_id)
+        if bill is not None and not bill.paid:
+            self._unindex_bill(bill)
+            bill.paid = True
+            bill.paid_date = paid_date or date.today()
+        return bill
+    
+    def reschedule_bill(self, bill_id: str, due_date: date) -> Optional[Bill]:
+        """Move a bill to a new due date, returning it if found."""
+        bill = self.get_bill(bill_id)
+        if bill is not None:
+            bill.due_date = due_date
+            # Rare, so rebuild rather than work out where it sits among same-day bills
+            self._bill_index = None
+        return bill
+    
+    def envelope_balance_snapshot(self) -> Dict[str, float]:
+        """Get envelope ID -> current balance."""
+        return {e.id: e.current_balance for e in self.envelopes}
+    
+    def get_envelopes_by_category(self, *categories: EnvelopeCategory) -> List[Envelope]:
+        """Get envelopes in any of the given categories, in profile order."""
+        wanted = set(categories)
+        return [e for e in self.envelopes if e.category in wanted]
+    
     def get_envelope(self, envelope_id: str) -> Optional[Envelope]:
         """Get envelope by ID."""
         for envelope in self.envelopes:
@@ -226,20 +323,28 @@ class UserBudgetProfile(BaseModel):
         return None
     
     def get_bills_due_before(self, cutoff_date: date) -> List[Bill]:
-        """Get bills due before a specific date."""
-        return [
-            bill for bill in self.bills
-            if not bill.paid and bill.due_date <= cutoff_date
-        ]
+        """Get unpaid bills due on or before a specific date, earliest first."""
+        due_dates, sorted_bills = self._unpaid_bills_by_due_date()
+        return sorted_bills[:bisect_right(due_dates, cutoff_date)]
+    
+    def get_bills_due_between(self, start_date: date, end_date: date) -> List[Bill]:
+        """Get unpaid bills due within [start_date, end_date], earliest first."""
+        due_dates, sorted_bills = self._unpaid_bills_by_due_date()
+        return sorted_bills[bisect_left(due_dates, start_date):bisect_right(due_dates, end_date)]
     
     def get_active_debts(self) -> List[Debt]:
         """Get debts that are not paid off."""
         return [debt for debt in self.debts if not debt.paid_off]
     
-    def get_urgent_sinking_funds(self) -> List[SinkingFund]:
-        """Get sinking funds with approaching deadlines (<= 3 months)."""
-        today = date.today()
-        return [
-            sf for sf in self.sinking_funds
-            if sf.months_remaining <= 3 and sf.current_balance < sf.target_amount
-        ]
\ No newline at end of file
+    def get_urgent_sinking_funds(self, today: Optional[date] = None) -> List[SinkingFund]:
+        """Get sinking funds with approaching deadlines (<= 3 months), most urgent first."""
+        today = today or date.today()
+        
+        # Months remaining is computed once per fund and reused as the sort key
+        urgent = []
+        for sf in self.sinking_funds:
+            months = sf.months_remaining_as_of(today)
+            if months <= 3 and sf.current_balance < sf.target_amount:
+                urgent.append((months, sf))
+        urgent.sort(key=lambda pair: pair[0])
+        return [sf for _, sf in urgent]
\ No newline at end of file
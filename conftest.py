@@ -0,0 +1,7 @@
+"""
+Shared pytest setup: make the app packages importable from any working directory.
+"""
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).parent))
@@ -1,21 +1,84 @@
 """
 Database models for the finance application.
 """
+import os
 import uuid
+from contextlib import contextmanager
 from datetime import datetime, date
-from typing import Optional, List, Dict, Any
-from decimal import Decimal
+from itertools import islice
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Type
+from decimal import Decimal, ROUND_HALF_UP
 from sqlalchemy import (
-    create_engine, Column, String, Integer, Float, Boolean, 
-    DateTime, Date, Text, ForeignKey, JSON, Enum, Numeric, UniqueConstraint
+    create_engine, event, make_url, select, Column, String, Integer, BigInteger, Float, Boolean, 
+    DateTime, Date, Text, ForeignKey, JSON, Numeric, UniqueConstraint, Index, Uuid
 )
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker, Session
-from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship, sessionmaker, validates, column_property, Session
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql import func, text
 import enum
 
 Base = declarative_base()
 
+# Binary JSONB on PostgreSQL (parsed once, indexable with GIN); plain JSON elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+class _UUID(TypeDecorator):
+    """
+    Native UUID on PostgreSQL, CHAR(32) elsewhere; values are uuid.UUID objects.
+    
+    IDs used to be strings, so string arguments (e.g. IDs from a URL or the
+    old String(36) columns) are parsed rather than rejected.
+    """
+    impl = Uuid
+    cache_ok = True
+    
+    def __init__(self):
+        super().__init__(as_uuid=True)
+    
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return uuid.UUID(value)
+        return value
+
+
+UUIDType = _UUID()
+
+# Integer cents for running balances and totals that are summed and updated
+# often; user-entered amounts stay Numeric(12, 2)
+MoneyCents = BigInteger
+
+_CENT = Decimal("0.01")
+
+
+def _to_cents(amount: Any) -> Optional[int]:
+    """Convert a dollar amount to integer cents, rounding half up."""
+    if amount is None:
+        return None
+    return int((Decimal(str(amount)) / _CENT).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+
+
+def dollars_property(cents_attr: str) -> hybrid_property:
+    """Expose an integer-cents column as a Decimal dollar amount, in Python and SQL."""
+    def fget(self):
+        cents = getattr(self, cents_attr)
+        return None if cents is None else Decimal(cents).scaleb(-2)
+    
+    def fset(self, value):
+        setattr(self, cents_attr, _to_cents(value))
+    
+    def expr(cls):
+        return getattr(cls, cents_attr) / 100
+    
+    prop = hybrid_property(fget, fset, expr=expr)
+    prop.cents_attr = cents_attr  # Lets bulk_insert map dollar keys to the cents column
+    return prop
+
 
 class ProvinceEnum(enum.Enum):
     AB = "AB"
@@ -70,74 +133,118 @@ class DebtStrategyEnum(enum.Enum):
     SNOWBALL = "snowball"
 
 
+def _enum_value(enum_cls: Type[enum.Enum], key: str, value: Any) -> Optional[str]:
+    """Normalize an enum member or raw value to the stored string, rejecting unknown values."""
+    if value is None:
+        return None
+    if isinstance(value, enum_cls):
+        return value.value
+    if value not in enum_cls._value2member_map_:
+        raise ValueError(f"Invalid {key}: {value!r}")
+    return value
+
+
+# Clears the version and variant bits of a random 128-bit int / sets them to v4, RFC 4122
+_UUID4_CLEAR = ~((0xF000 << 64) | (0xC000 << 48))
+_UUID4_SET = (0x4000 << 64) | (0x8000 << 48)
+
+
+def _batch_uuid4(count: int) -> List[uuid.UUID]:
+    """Generate random (version 4) UUIDs from a single os.urandom call."""
+    raw = os.urandom(16 * count)
+    from_bytes = int.from_bytes
+    return [
+        uuid.UUID(int=(from_bytes(raw[i:i + 16], "big") & _UUID4_CLEAR) | _UUID4_SET)
+        for i in range(0, 16 * count, 16)
+    ]
+
+
+def _pop_keys(kwargs: Dict[str, Any], keys: Iterable[str]) -> Dict[str, Any]:
+    """Remove and return the given keys from a constructor's kwargs."""
+    return {key: kwargs.pop(key) for key in keys if key in kwargs}
+
+
 class User(Base):
     """User account."""
     __tablename__ = "users"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
     email = Column(String(255), unique=True, nullable=False, index=True)
     username = Column(String(100), unique=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
-    province = Column(Enum(ProvinceEnum), nullable=False)
+    province = Column(String(2), nullable=False)  # ProvinceEnum value
     tax_year = Column(Integer, nullable=False, default=2024)
-    pay_schedule = Column(Enum(PayScheduleEnum), nullable=False, default=PayScheduleEnum.BIWEEKLY)
+    pay_schedule = Column(String(20), nullable=False, default=PayScheduleEnum.BIWEEKLY.value)
     next_payday = Column(Date, nullable=True)  # Added for pay schedule
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    settings = Column(JSON, nullable=False, default=dict)
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
+    settings = Column(JSONType, nullable=False, default=dict)
+    meta_data = Column(JSONType, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
     # Relationships
-    income_streams = relationship("IncomeStream", back_populates="user", cascade="all, delete-orphan")
-    envelopes = relationship("Envelope", back_populates="user", cascade="all, delete-orphan")
-    bills = relationship("Bill", back_populates="user", cascade="all, delete-orphan")
-    bill_occurrences = relationship("BillOccurrence", back_populates="user", cascade="all, delete-orphan")
-    debts = relationship("Debt", back_populates="user", cascade="all, delete-orphan")
-    sinking_funds = relationship("SinkingFund", back_populates="user", cascade="all, delete-orphan")
-    savings_goals = relationship("SavingsGoal", back_populates="user", cascade="all, delete-orphan")
-    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
-    paychecks = relationship("Paycheck", back_populates="user", cascade="all, delete-orphan")
-    paycheque_windows = relationship("PaychequeWindow", back_populates="user", cascade="all, delete-orphan")
+    income_streams = relationship("IncomeStream", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    envelopes = relationship("Envelope", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    bills = relationship("Bill", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    bill_occurrences = relationship("BillOccurrence", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    debts = relationship("Debt", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    sinking_funds = relationship("SinkingFund", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    savings_goals = relationship("SavingsGoal", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    paychecks = relationship("Paycheck", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    paycheque_windows = relationship("PaychequeWindow", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    
+    @validates("province")
+    def _validate_province(self, key, value):
+        return _enum_value(ProvinceEnum, key, value)
+    
+    @validates("pay_schedule")
+    def _validate_pay_schedule(self, key, value):
+        return _enum_value(PayScheduleEnum, key, value)
 
 
 class IncomeStream(Base):
     """Income source for a user."""
     __tablename__ = "income_streams"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     type = Column(String(50), nullable=False)  # salary, overtime, bonus, irregular, reimbursement
     gross_amount = Column(Numeric(12, 2), nullable=False)
-    frequency = Column(Enum(PayScheduleEnum), nullable=False)
+    frequency = Column(String(20), nullable=False)  # PayScheduleEnum value
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=True)
-    deductions = Column(JSON, nullable=False, default=dict)  # RRSP, union, benefits, etc.
+    deductions = Column(JSONType, nullable=False, default=dict)  # RRSP, union, benefits, etc.
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
+    meta_data = Column(JSONType, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
     # Relationships
     user = relationship("User", back_populates="income_streams")
+    
+    @validates("frequency")
+    def _validate_frequency(self, key, value):
+        return _enum_value(PayScheduleEnum, key, value)
 
 
 class Envelope(Base):
     """Budget envelope for allocating funds."""
     __tablename__ = "envelopes"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    category = Column(Enum(EnvelopeCategoryEnum), nullable=False)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    category = Column(String(20), nullable=False)  # EnvelopeCategoryEnum value
     name = Column(String(100), nullable=False)
     target_amount = Column(Numeric(12, 2), nullable=False, default=0)
-    current_balance = Column(Numeric(12, 2), nullable=False, default=0)
+    current_balance_cents = Column(MoneyCents, nullable=False, default=0)
+    current_balance = dollars_property("current_balance_cents")
     priority = Column(Integer, nullable=False, default=5)
     due_date = Column(Date, nullable=True)
-    recurrence = Column(Enum(RecurrenceEnum), nullable=True)
+    recurrence = Column(String(20), nullable=True)  # RecurrenceEnum value
     auto_pay = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
+    meta_data = Column(JSONType, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
     # Relationships
     user = relationship("User", back_populates="envelopes")
@@ -146,84 +253,122 @@ class Envelope(Base):
     sinking_funds = relationship("SinkingFund", back_populates="envelope")
     savings_goals = relationship("SavingsGoal", back_populates="envelope")
     transactions = relationship("Transaction", back_populates="envelope")
+    
+    @validates("category")
+    def _validate_category(self, key, value):
+        return _enum_value(EnvelopeCategoryEnum, key, value)
+    
+    @validates("recurrence")
+    def _validate_recurrence(self, key, value):
+        return _enum_value(RecurrenceEnum, key, value)
 
 
 class Bill(Base):
     """Bill or recurring expense."""
     __tablename__ = "bills"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    envelope_id = Column(String(36), ForeignKey("envelopes.id"), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    envelope_id = Column(UUIDType, ForeignKey("envelopes.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     amount = Column(Numeric(12, 2), nullable=False)
-    bill_type = Column(Enum(BillTypeEnum), nullable=False)
+    bill_type = Column(String(20), nullable=False)  # BillTypeEnum value
     due_date = Column(Date, nullable=False)
-    recurrence = Column(Enum(RecurrenceEnum), nullable=True)
+    recurrence = Column(String(20), nullable=True)  # RecurrenceEnum value
     paid = Column(Boolean, nullable=False, default=False)
     paid_date = Column(Date, nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
+    meta_data = Column(JSONType, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
     # Relationships
     user = relationship("User", back_populates="bills")
     envelope = relationship("Envelope", back_populates="bills")
-    occurrences = relationship("BillOccurrence", back_populates="bill", cascade="all, delete-orphan")
+    occurrences = relationship("BillOccurrence", back_populates="bill", cascade="all, delete-orphan", passive_deletes=True)
+    
+    @validates("bill_type")
+    def _validate_bill_type(self, key, value):
+        return _enum_value(BillTypeEnum, key, value)
+    
+    @validates("recurrence")
+    def _validate_recurrence(self, key, value):
+        return _enum_value(RecurrenceEnum, key, value)
+    
+    __table_args__ = (
+        Index("ix_bill_user_due_date", "user_id", "due_date"),
+        # Partial index over pending bills only, for "what's due" queries
+        Index("ix_bill_unpaid", "user_id", "due_date",
+              postgresql_where=text("paid = false"), sqlite_where=text("paid = 0")),
+    )
 
 
 class BillOccurrence(Base):
     """Individual occurrence of a bill for a specific paycheque window."""
     __tablename__ = "bill_occurrences"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    bill_id = Column(String(36), ForeignKey("bills.id"), nullable=False, index=True)
-    paycheque_window_id = Column(String(36), ForeignKey("paycheque_windows.id"), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    bill_id = Column(UUIDType, ForeignKey("bills.id", ondelete="CASCADE"), nullable=False, index=True)
+    paycheque_window_id = Column(UUIDType, ForeignKey("paycheque_windows.id", ondelete="CASCADE"), nullable=False, index=True)
     amount = Column(Numeric(12, 2), nullable=False)
     due_date = Column(Date, nullable=False)
     paid = Column(Boolean, nullable=False, default=False)
     paid_date = Column(Date, nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)
+    meta_data = Column(JSONType, nullable=False, default=dict)
     
     # Relationships
     user = relationship("User", back_populates="bill_occurrences")
     bill = relationship("Bill", back_populates="occurrences")
     paycheque_window = relationship("PaychequeWindow", back_populates="bill_occurrences")
+    
+    __table_args__ = (
+        Index("ix_bill_occurrence_user_due_date", "user_id", "due_date"),
+        Index("ix_bill_occurrence_unpaid", "user_id", "due_date",
+              postgresql_where=text("paid = false"), sqlite_where=text("paid = 0")),
+    )
 
 
 class Debt(Base):
     """Debt account."""
     __tablename__ = "debts"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    envelope_id = Column(String(36), ForeignKey("envelopes.id"), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    envelope_id = Column(UUIDType, ForeignKey("envelopes.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     balance = Column(Numeric(12, 2), nullable=False)
     apr = Column(Numeric(5, 4), nullable=False)  # 0.0000 to 1.0000
     minimum_payment = Column(Numeric(12, 2), nullable=False)
     due_date = Column(Date, nullable=False)
-    strategy = Column(Enum(DebtStrategyEnum), nullable=False, default=DebtStrategyEnum.AVALANCHE)
+    strategy = Column(String(20), nullable=False, default=DebtStrategyEnum.AVALANCHE.value)
     paid_off = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
+    meta_data = Column(JSONType, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
     # Relationships
     user = relationship("User", back_populates="debts")
     envelope = relationship("Envelope", back_populates="debts")
+    
+    __table_args__ = (
+        Index("ix_debt_open", "user_id",
+              postgresql_where=text("paid_off = false"), sqlite_where=text("paid_off = 0")),
+    )
+    
+    @validates("strategy")
+    def _validate_strategy(self, key, value):
+        return _enum_value(DebtStrategyEnum, key, value)
 
 
 class SinkingFund(Base):
     """Sinking fund for future expenses."""
     __tablename__ = "sinking_funds"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    envelope_id = Column(String(36), ForeignKey("envelopes.id"), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    envelope_id = Column(UUIDType, ForeignKey("envelopes.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     target_amount = Column(Numeric(12, 2), nullable=False)
     current_balance = Column(Numeric(12, 2), nullable=False, default=0)
@@ -231,7 +376,7 @@ class SinkingFund(Base):
     monthly_contribution = Column(Numeric(12, 2), nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
+    meta_data = Column(JSONType, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
     # Relationships
     user = relationship("User", back_populates="sinking_funds")
@@ -242,9 +387,9 @@ class SavingsGoal(Base):
     """Savings or investing goal."""
     __tablename__ = "savings_goals"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    envelope_id = Column(String(36), ForeignKey("envelopes.id"), nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    envelope_id = Column(UUIDType, ForeignKey("envelopes.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     target_amount = Column(Numeric(12, 2), nullable=False)
     current_balance = Column(Numeric(12, 2), nullable=False, default=0)
@@ -253,7 +398,7 @@ class SavingsGoal(Base):
     investment_strategy = Column(String(100), nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
+    meta_data = Column(JSONType, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
     # Relationships
     user = relationship("User", back_populates="savings_goals")
@@ -264,36 +409,59 @@ class Transaction(Base):
     """Financial transaction."""
     __tablename__ = "transactions"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    envelope_id = Column(String(36), ForeignKey("envelopes.id"), nullable=True, index=True)
-    date = Column(Date, nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    envelope_id = Column(UUIDType, ForeignKey("envelopes.id"), nullable=True, index=True)
+    date = Column(Date, nullable=False)
     amount = Column(Numeric(12, 2), nullable=False)
     description = Column(String(255), nullable=False)
     category = Column(String(100), nullable=True)
     merchant = Column(String(100), nullable=True)
     transaction_type = Column(String(50), nullable=False)  # income, expense, transfer
     split = Column(Boolean, nullable=False, default=False)
-    parent_transaction_id = Column(String(36), ForeignKey("transactions.id"), nullable=True)
+    parent_transaction_id = Column(UUIDType, ForeignKey("transactions.id"), nullable=True)
     imported = Column(Boolean, nullable=False, default=False)
     import_source = Column(String(100), nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
     # Relationships
     user = relationship("User", back_populates="transactions")
     envelope = relationship("Envelope", back_populates="transactions")
     parent = relationship("Transaction", remote_side=[id], backref="splits")
+    extras = relationship("TransactionExtras", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Cold JSON lives in transaction_extras to keep ledger rows narrow
+    meta_data = association_proxy("extras", "meta_data",
+                                  creator=lambda v: TransactionExtras(meta_data=v))
+    
+    def __init__(self, **kwargs):
+        extras = TransactionExtras(**_pop_keys(kwargs, TransactionExtras.PROXIED))
+        super().__init__(extras=extras, **kwargs)
+    
+    # Per-user date-range scans; the included columns cover ledger listings
+    __table_args__ = (
+        Index("ix_txn_user_date", "user_id", "date",
+              postgresql_include=["amount", "envelope_id", "transaction_type"]),
+    )
+
+
+class TransactionExtras(Base):
+    """Rarely read transaction data, split out of the hot transactions table."""
+    __tablename__ = "transaction_extras"
+    PROXIED = ("meta_data",)
+    
+    transaction_id = Column(UUIDType, ForeignKey("transactions.id", ondelete="CASCADE"), primary_key=True)
+    meta_data = Column(JSONType, nullable=False, default=dict)
 
 
 class Paycheck(Base):
     """Paycheck record."""
     __tablename__ = "paychecks"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    date = Column(Date, nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    date = Column(Date, nullable=False)
     gross_amount = Column(Numeric(12, 2), nullable=False)
     net_amount = Column(Numeric(12, 2), nullable=False)
     federal_tax = Column(Numeric(12, 2), nullable=False)
@@ -302,65 +470,155 @@ class Paycheck(Base):
     ei_contribution = Column(Numeric(12, 2), nullable=False)
     qpp_contribution = Column(Numeric(12, 2), nullable=True)
     qpip_contribution = Column(Numeric(12, 2), nullable=True)
-    other_deductions = Column(JSON, nullable=False, default=dict)
-    allocations = Column(JSON, nullable=False, default=dict)  # envelope_id -> amount
-    remaining_amount = Column(Numeric(12, 2), nullable=False, default=0)
+    remaining_amount_cents = Column(MoneyCents, nullable=False, default=0)
+    remaining_amount = dollars_property("remaining_amount_cents")
     applied = Column(Boolean, nullable=False, default=False)
     applied_date = Column(Date, nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
     # Relationships
     user = relationship("User", back_populates="paychecks")
+    extras = relationship("PaycheckExtras", uselist=False, cascade="all, delete-orphan", passive_deletes=True)
+    
+    # Cold JSON lives in paycheck_extras to keep paycheck rows narrow
+    other_deductions = association_proxy("extras", "other_deductions",
+                                         creator=lambda v: PaycheckExtras(other_deductions=v))
+    allocations = association_proxy("extras", "allocations",
+                                    creator=lambda v: PaycheckExtras(allocations=v))
+    meta_data = association_proxy("extras", "meta_data",
+                                  creator=lambda v: PaycheckExtras(meta_data=v))
+    
+    def __init__(self, **kwargs):
+        extras = PaycheckExtras(**_pop_keys(kwargs, PaycheckExtras.PROXIED))
+        super().__init__(extras=extras, **kwargs)
+    
+    __table_args__ = (Index("ix_paycheck_user_date", "user_id", "date"),)
+
+
+class PaycheckExtras(Base):
+    """Rarely read paycheck data, split out of the hot paychecks table."""
+    __tablename__ = "paycheck_extras"
+    PROXIED = ("other_deductions", "allocations", "meta_data")
+    
+    paycheck_id = Column(UUIDType, ForeignKey("paychecks.id", ondelete="CASCADE"), primary_key=True)
+    other_deductions = Column(JSONType, nullable=False, default=dict)
+    allocations = Column(JSONType, nullable=False, default=dict)  # envelope_id -> amount
+    meta_data = Column(JSONType, nullable=False, default=dict)
+    
+    __table_args__ = (
+        Index("ix_paycheck_allocations_gin", "allocations",
+              postgresql_using="gin", postgresql_ops={"allocations": "jsonb_path_ops"}
+              ).ddl_if(dialect="postgresql"),
+    )
 
 
 class PaychequeWindow(Base):
     """Window between paycheques for bill assignment."""
     __tablename__ = "paycheque_windows"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    user_id = Column(String(36), ForeignKey("users.id"), nullable=False, index=True)
-    start_date = Column(Date, nullable=False, index=True)
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUIDType, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False, index=True)
-    paycheck_id = Column(String(36), ForeignKey("paychecks.id"), nullable=True, index=True)
-    total_bills = Column(Numeric(12, 2), nullable=False, default=0)
-    total_allocated = Column(Numeric(12, 2), nullable=False, default=0)
-    remaining_budget = Column(Numeric(12, 2), nullable=False, default=0)
+    paycheck_id = Column(UUIDType, ForeignKey("paychecks.id"), nullable=True, index=True)
+    # Sum of this window's bill occurrences, computed in SQL so it never drifts.
+    # Deferred: loaded on first access, or eagerly with undefer(PaychequeWindow.total_bills)
+    total_bills = column_property(
+        select(func.coalesce(func.sum(BillOccurrence.amount), 0))
+        .where(BillOccurrence.paycheque_window_id == id)
+        .correlate_except(BillOccurrence)
+        .scalar_subquery(),
+        deferred=True
+    )
+    total_allocated_cents = Column(MoneyCents, nullable=False, default=0)
+    total_allocated = dollars_property("total_allocated_cents")
+    remaining_budget_cents = Column(MoneyCents, nullable=False, default=0)
+    remaining_budget = dollars_property("remaining_budget_cents")
     status = Column(String(20), nullable=False, default="pending")  # pending, active, completed, archived
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)
+    meta_data = Column(JSONType, nullable=False, default=dict)
     
     # Relationships
     user = relationship("User", back_populates="paycheque_windows")
     paycheck = relationship("Paycheck")
-    bill_occurrences = relationship("BillOccurrence", back_populates="paycheque_window", cascade="all, delete-orphan")
+    bill_occurrences = relationship("BillOccurrence", back_populates="paycheque_window", cascade="all, delete-orphan", passive_deletes=True)
+    
+    __table_args__ = (Index("ix_paycheque_window_user_start_date", "user_id", "start_date"),)
 
 
 class TaxTable(Base):
     """Stored tax table data."""
     __tablename__ = "tax_tables"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(UUIDType, primary_key=True, default=uuid.uuid4)
     year = Column(Integer, nullable=False, index=True)
     jurisdiction = Column(String(10), nullable=False, index=True)  # 'federal' or province code
-    data = Column(JSON, nullable=False)
+    data = Column(JSONType, nullable=False)
     source = Column(String(255), nullable=True)
     citation = Column(Text, nullable=True)
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
-    meta_data = Column(JSON, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
+    meta_data = Column(JSONType, nullable=False, default=dict)  # Changed from 'metadata' to 'meta_data'
     
-    # Unique constraint
-    __table_args__ = (UniqueConstraint('year', 'jurisdiction', name='unique_year_jurisdiction'),)
+    # Unique constraint, plus a GIN index for JSONB containment queries on data
+    __table_args__ = (
+        UniqueConstraint('year', 'jurisdiction', name='unique_year_jurisdiction'),
+        Index("ix_taxtable_data_gin", "data",
+              postgresql_using="gin", postgresql_ops={"data": "jsonb_path_ops"}
+              ).ddl_if(dialect="postgresql"),
+    )
+
+
+# Applied to every new SQLite connection: WAL lets readers run alongside the
+# writer, and NORMAL sync is durable in WAL mode without an fsync per commit
+SQLITE_PRAGMAS = (
+    "PRAGMA foreign_keys=ON",  # Needed for ON DELETE CASCADE
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
 
 
 class Database:
     """Database manager."""
     
+    # Rows per INSERT statement / executemany batch for bulk paths
+    BULK_BATCH_SIZE = 10_000
+    
     def __init__(self, database_url: str = "sqlite:///finance.db"):
-        self.engine = create_engine(database_url)
+        url = make_url(database_url)
+        engine_options: Dict[str, Any] = {
+            "query_cache_size": 1200,
+            "insertmanyvalues_page_size": self.BULK_BATCH_SIZE,
+        }
+        
+        if url.get_backend_name() == "sqlite":
+            engine_options["connect_args"] = {"check_same_thread": False}
+            if url.database in (None, "", ":memory:"):
+                # An in-memory database only lives as long as its connection
+                engine_options["poolclass"] = StaticPool
+        else:
+            engine_options.update(
+                pool_size=20,
+                max_overflow=40,
+                pool_pre_ping=True,
+                pool_recycle=1800,
+            )
+        
+        self.engine = create_engine(url, **engine_options)
+        if url.get_backend_name() == "sqlite":
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
         self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
     
     def init_db(self):
@@ -374,6 +632,191 @@ class Database:
     def close_session(self, session: Session):
         """Close database session."""
         session.close()
+    
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """
+        Provide a transactional session: commit on success, roll back on error.
+        
+        The session is always closed, returning its connection to the pool.
+        
+        Example:
+            with db.session_scope() as session:
+                session.add(envelope)
+        """
+        session = self.SessionLocal()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    def add_all_batched(self, objects: Iterable[Base], batch_size: int = 1000) -> int:
+        """
+        Add ORM objects in one transaction for long ingestion loops.
+        
+        Every batch_size objects the session is flushed and its identity map
+        cleared, so memory stays flat however many objects are added. Use
+        bulk_insert instead when plain column dicts are enough.
+        
+        Args:
+            objects: Mapped instances to persist
+            batch_size: Objects per flush
+            
+        Returns:
+            Number of objects added
+        """
+        added = 0
+        with self.session_scope() as session:
+            for obj in objects:
+                session.add(obj)
+                added += 1
+                if added % batch_size == 0:
+                    session.flush()
+                    session.expunge_all()
+        return added
+    
+    def bulk_insert(
+        self,
+        model_cls: Type[Base],
+        rows: Iterable[Dict[str, Any]],
+        batch_size: int = BULK_BATCH_SIZE
+    ) -> int:
+        """
+        Insert many rows with batched Core INSERTs instead of per-row ORM adds.
+        
+        Used for generated rows such as bill occurrences, imported
+        transactions and paychecks. Rows are pulled from the iterable in
+        chunks, so a generator is never fully materialized. Column defaults
+        (IDs, timestamps, empty JSON) are applied as with the ORM, but
+        @validates hooks are not: pass enum columns as their string values.
+        
+        Missing IDs are generated per batch from one os.urandom call.
+        Timestamps are left to the column defaults on purpose: func.now()
+        is rendered into the statement rather than called per row, and a
+        Python timestamp measured slower, since it has to be bound per row.
+        
+        For models with an extras side table (Transaction, Paycheck), the
+        proxied JSON keys in each row are written to that table, and an
+        extras row is always created so the proxies read back as {}.
+        
+        Dollar properties backed by a cents column (e.g. Envelope.current_balance)
+        may be passed by their dollar name; any other key that isn't a column
+        raises ValueError.
+        
+        Args:
+            model_cls: Mapped model class, e.g. BillOccurrence
+            rows: Column name -> value dicts
+            batch_size: Rows per executemany call
+            
+        Returns:
+            Number of rows inserted
+        """
+        insert_stmt = model_cls.__table__.insert()
+        has_id = "id" in model_cls.__table__.c
+        relationships = model_cls.__mapper__.relationships
+        extras_cls = relationships["extras"].mapper.class_ if "extras" in relationships else None
+        
+        # Core silently drops keys that aren't columns, so dollar properties
+        # are converted to their cents columns and anything else is rejected
+        dollar_keys = {
+            name: descriptor.cents_attr
+            for name, descriptor in model_cls.__mapper__.all_orm_descriptors.items()
+            if getattr(descriptor, "cents_attr", None)
+        }
+        allowed_keys = set(model_cls.__table__.c.keys()) | dollar_keys.keys()
+        if extras_cls is not None:
+            allowed_keys.update(extras_cls.PROXIED)
+        
+        def prepare(row: Dict[str, Any]) -> Dict[str, Any]:
+            unknown = row.keys() - allowed_keys
+            if unknown:
+                raise ValueError(f"{model_cls.__name__} has no column(s) {sorted(unknown)}")
+            row = dict(row)
+            for key in dollar_keys.keys() & row.keys():
+                row[dollar_keys[key]] = _to_cents(row.pop(key))
+            return row
+        
+        rows = iter(rows)
+        inserted = 0
+        
+        with self.engine.begin() as conn:
+            while True:
+                chunk = list(islice(rows, batch_size))
+                if not chunk:
+                    break
+                
+                chunk = [prepare(row) for row in chunk]
+                if has_id:
+                    # One urandom call per batch instead of a uuid4() per row
+                    for new_id, row in zip(_batch_uuid4(len(chunk)), chunk):
+                        row.setdefault("id", new_id)
+                
+                if extras_cls is not None:
+                    # The extras rows need the parent IDs up front
+                    extras_fk = extras_cls.__table__.primary_key.columns[0].name
+                    extras_chunk = [
+                        {extras_fk: row["id"], **_pop_keys(row, extras_cls.PROXIED)}
+                        for row in chunk
+                    ]
+                
+                conn.execute(insert_stmt, chunk)
+                if extras_cls is not None:
+                    conn.execute(extras_cls.__table__.insert(), extras_chunk)
+                inserted += len(chunk)
+        
+        return inserted
+    
+    def upsert_tax_tables(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or replace tax tables keyed by (year, jurisdiction).
+        
+        Runs as one INSERT ... ON CONFLICT DO UPDATE executemany, with no
+        per-row SELECT as session.merge would issue. Existing rows keep
+        their ID and get the new data, source and citation.
+        
+        Args:
+            rows: Dicts with year, jurisdiction, data and optionally source
+                and citation
+            
+        Returns:
+            Number of rows written
+        """
+        rows = list(rows)
+        if not rows:
+            return 0
+        
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            stmt = pg_insert(TaxTable)
+        elif dialect == "sqlite":
+            stmt = sqlite_insert(TaxTable)
+        else:
+            raise NotImplementedError(f"Tax table upsert is not supported on {dialect}")
+        
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["year", "jurisdiction"],
+            set_={
+                "data": stmt.excluded.data,
+                "source": stmt.excluded.source,
+                "citation": stmt.excluded.citation,
+                "updated_at": func.now(),
+            }
+        )
+        rows = [{"source": None, "citation": None, **row} for row in rows]
+        
+        with self.engine.begin() as conn:
+            conn.execute(stmt, rows)
+        
+        # Core statements skip the ORM events that keep the lookup cache fresh;
+        # clear only now that begin() has committed, so readers can't re-cache old rows
+        from .queries import get_tax_table
+        get_tax_table.cache_clear()
+        
+        return len(rows)
 
 
 # Default database instance
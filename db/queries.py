@@ -0,0 +1,242 @@
+"""
+Read queries and bulk state updates for the finance application.
+"""
+import uuid
+from collections import defaultdict
+from datetime import date
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Dict, List, Any, Iterable
+from sqlalchemy import event, lambda_stmt, select, update
+from sqlalchemy.orm import Session, aliased, object_session, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .models import (
+    Database, User, Envelope, Bill, BillOccurrence, Paycheck, PaychequeWindow,
+    Transaction, TaxTable, default_db
+)
+
+# IDs per UPDATE ... WHERE id IN (...), well under SQLite's bound-parameter limit
+UPDATE_BATCH_SIZE = 10_000
+
+
+def load_user_full(session: Session, user_id: uuid.UUID) -> Optional[User]:
+    """
+    Load a user with the collections the dashboard reads, eagerly.
+    
+    Each collection is fetched with one SELECT ... WHERE parent_id IN (...)
+    query (selectinload) instead of one lazy load per parent row, and
+    without the row explosion a joined eager load of several collections
+    would cause.
+    
+    Args:
+        session: Database session
+        user_id: ID of the user to load
+        
+    Returns:
+        User with envelopes (and their bills), paycheque windows (and their
+        bill occurrences), debts and paychecks loaded, or None if not found
+    """
+    stmt = (
+        select(User)
+        .where(User.id == user_id)
+        .options(
+            selectinload(User.envelopes).selectinload(Envelope.bills),
+            selectinload(User.paycheque_windows).selectinload(PaychequeWindow.bill_occurrences),
+            selectinload(User.debts),
+            selectinload(User.paychecks),
+        )
+    )
+    return session.execute(stmt).scalar_one_or_none()
+
+
+def load_transaction_tree(session: Session, root_id: uuid.UUID) -> Optional[Transaction]:
+    """
+    Load a transaction and all of its splits, at any depth, in one query.
+    
+    A recursive CTE walks parent_transaction_id from the root, and the
+    matching rows are loaded as Transaction objects. Every node's splits
+    collection and each split's parent are then filled from those rows, so
+    walking the tree issues no further queries.
+    
+    Args:
+        session: Database session
+        root_id: ID of the top-level transaction
+        
+    Returns:
+        Root transaction with splits populated, or None if not found
+    """
+    tree = (
+        select(Transaction.id)
+        .where(Transaction.id == root_id)
+        .cte("transaction_tree", recursive=True)
+    )
+    child = aliased(Transaction)
+    # UNION (not UNION ALL) so a corrupt cycle terminates instead of recursing forever
+    tree = tree.union(
+        select(child.id).where(child.parent_transaction_id == tree.c.id)
+    )
+    
+    transactions = session.execute(
+        select(Transaction)
+        .where(Transaction.id.in_(select(tree.c.id)))
+        .order_by(Transaction.date)
+    ).scalars().all()
+    
+    splits_by_parent: Dict[uuid.UUID, List[Transaction]] = defaultdict(list)
+    root = None
+    for transaction in transactions:
+        if transaction.id == root_id:
+            root = transaction
+        else:
+            splits_by_parent[transaction.parent_transaction_id].append(transaction)
+    
+    for transaction in transactions:
+        splits = splits_by_parent.get(transaction.id, [])
+        set_committed_value(transaction, "splits", splits)
+        for split in splits:
+            set_committed_value(split, "parent", transaction)
+    
+    return root
+
+
+# Per-user reads issued on every page load. Built with lambda_stmt so the
+# statement's construction, compiled SQL and result processing are cached
+# on the lambda's code; each call only binds the closure values.
+
+def envelopes_for_user(session: Session, user_id: uuid.UUID) -> List[Envelope]:
+    """Get a user's envelopes, highest priority first."""
+    stmt = lambda_stmt(
+        lambda: select(Envelope)
+        .where(Envelope.user_id == user_id)
+        .order_by(Envelope.priority, Envelope.name)
+    )
+    return session.execute(stmt).scalars().all()
+
+
+def unpaid_bills_for_user(session: Session, user_id: uuid.UUID) -> List[Bill]:
+    """Get a user's unpaid bills, earliest due first (served by ix_bill_unpaid)."""
+    stmt = lambda_stmt(
+        lambda: select(Bill)
+        .where(Bill.user_id == user_id, Bill.paid == False)  # noqa: E712
+        .order_by(Bill.due_date)
+    )
+    return session.execute(stmt).scalars().all()
+
+
+def transactions_between(
+    session: Session, user_id: uuid.UUID, start_date: date, end_date: date
+) -> List[Transaction]:
+    """Get a user's transactions dated within [start_date, end_date] (served by ix_txn_user_date)."""
+    stmt = lambda_stmt(
+        lambda: select(Transaction)
+        .where(Transaction.user_id == user_id,
+               Transaction.date >= start_date,
+               Transaction.date <= end_date)
+        .order_by(Transaction.date)
+    )
+    return session.execute(stmt).scalars().all()
+
+
+@lru_cache(maxsize=64)
+def get_tax_table(year: int, jurisdiction: str, db: Database = default_db) -> Optional[Dict[str, Any]]:
+    """
+    Get the stored tax table data for a year and jurisdiction, cached in-process.
+    
+    Tax tables change at most a few times a year, so repeat lookups are a
+    dict hit instead of a query and JSON parse. The cache is cleared
+    whenever a TaxTable is written through the ORM or
+    Database.upsert_tax_tables.
+    The returned dict is shared between callers; treat it as read-only.
+    
+    Args:
+        year: Tax year
+        jurisdiction: 'federal' or province code
+        db: Database to read from
+        
+    Returns:
+        The table's data, or None if no table is stored
+    """
+    with db.session_scope() as session:
+        return session.execute(
+            select(TaxTable.data)
+            .where(TaxTable.year == year, TaxTable.jurisdiction == jurisdiction)
+        ).scalar_one_or_none()
+
+
+# Session.info flag set when a flush writes TaxTable rows
+_TAX_TABLES_WRITTEN = "tax_tables_written"
+
+
+@event.listens_for(TaxTable, "after_insert")
+@event.listens_for(TaxTable, "after_update")
+@event.listens_for(TaxTable, "after_delete")
+def _mark_tax_tables_written(mapper, connection, target):
+    """Note a TaxTable write; the cache is cleared once it commits."""
+    session = object_session(target)
+    if session is not None:
+        session.info[_TAX_TABLES_WRITTEN] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_tax_table_cache(session):
+    """Drop cached tax tables after a commit that wrote TaxTable rows.
+    
+    Clearing at flush would let another session re-cache the old row
+    before the write commits.
+    """
+    if session.info.pop(_TAX_TABLES_WRITTEN, False):
+        get_tax_table.cache_clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_tax_table_writes(session):
+    """Rolled-back writes never reached the database, so keep the cache."""
+    session.info.pop(_TAX_TABLES_WRITTEN, None)
+
+
+def _update_by_ids(session: Session, model_cls, ids: Iterable[uuid.UUID], values: Dict[str, Any]) -> int:
+    """Set the same column values on many rows with one UPDATE per batch of IDs."""
+    ids = iter(ids)
+    updated = 0
+    while True:
+        batch = list(islice(ids, UPDATE_BATCH_SIZE))
+        if not batch:
+            break
+        result = session.execute(
+            update(model_cls).where(model_cls.id.in_(batch)).values(**values)
+        )
+        updated += result.rowcount
+    return updated
+
+
+def mark_bills_paid(session: Session, occurrence_ids: Iterable[uuid.UUID], paid_date: date) -> int:
+    """
+    Mark many bill occurrences as paid without loading them.
+    
+    Args:
+        session: Database session (committed by the caller)
+        occurrence_ids: IDs of BillOccurrence rows to update
+        paid_date: Date the bills were paid
+        
+    Returns:
+        Number of rows updated
+    """
+    return _update_by_ids(session, BillOccurrence, occurrence_ids,
+                          {"paid": True, "paid_date": paid_date})
+
+
+def apply_paychecks(session: Session, paycheck_ids: Iterable[uuid.UUID], applied_date: date) -> int:
+    """
+    Mark many paychecks as applied without loading them.
+    
+    Args:
+        session: Database session (committed by the caller)
+        paycheck_ids: IDs of Paycheck rows to update
+        applied_date: Date the allocations were applied
+        
+    Returns:
+        Number of rows updated
+    """
+    return _update_by_ids(session, Paycheck, paycheck_ids,
+                          {"applied": True, "applied_date": applied_date})
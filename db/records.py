@@ -0,0 +1,168 @@
+"""
+Typed records for rows read from Supabase.
+"""
+from dataclasses import dataclass, fields
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Type, TypeVar
+import numpy as np
+
+R = TypeVar("R")
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    """Parse a PostgREST date string, passing through dates and None."""
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True, frozen=True)
+class EnvelopeRecord:
+    """Envelope row."""
+    id: str
+    profile_id: str
+    category: str
+    name: str
+    target_amount: float
+    current_balance: float
+    priority: int
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "EnvelopeRecord":
+        return cls(
+            id=row["id"],
+            profile_id=row["profile_id"],
+            category=row["category"],
+            name=row["name"],
+            target_amount=float(row.get("target_amount") or 0),
+            current_balance=float(row.get("current_balance") or 0),
+            priority=int(row.get("priority") or 10),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class BillRecord:
+    """Bill row."""
+    id: str
+    profile_id: str
+    envelope_id: Optional[str]
+    name: str
+    amount: float
+    bill_type: str
+    due_date: date
+    paid: bool
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "BillRecord":
+        return cls(
+            id=row["id"],
+            profile_id=row["profile_id"],
+            envelope_id=row.get("envelope_id"),
+            name=row["name"],
+            amount=float(row["amount"]),
+            bill_type=row["bill_type"],
+            due_date=_parse_date(row["due_date"]),
+            paid=bool(row.get("paid")),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class DebtRecord:
+    """Debt row."""
+    id: str
+    profile_id: str
+    envelope_id: Optional[str]
+    name: str
+    balance: float
+    apr: float
+    minimum_payment: float
+    due_date: date
+    strategy: str
+    paid_off: bool
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "DebtRecord":
+        return cls(
+            id=row["id"],
+            profile_id=row["profile_id"],
+            envelope_id=row.get("envelope_id"),
+            name=row["name"],
+            balance=float(row["balance"]),
+            apr=float(row["apr"]),
+            minimum_payment=float(row["minimum_payment"]),
+            due_date=_parse_date(row["due_date"]),
+            strategy=row["strategy"],
+            paid_off=bool(row.get("paid_off")),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class SinkingFundRecord:
+    """Sinking fund row."""
+    id: str
+    profile_id: str
+    envelope_id: Optional[str]
+    name: str
+    target_amount: float
+    current_balance: float
+    deadline: date
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "SinkingFundRecord":
+        return cls(
+            id=row["id"],
+            profile_id=row["profile_id"],
+            envelope_id=row.get("envelope_id"),
+            name=row["name"],
+            target_amount=float(row["target_amount"]),
+            current_balance=float(row.get("current_balance") or 0),
+            deadline=_parse_date(row["deadline"]),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class SavingsGoalRecord:
+    """Savings goal row."""
+    id: str
+    profile_id: str
+    envelope_id: Optional[str]
+    name: str
+    target_amount: float
+    current_balance: float
+    target_date: date
+    monthly_contribution: float
+    
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "SavingsGoalRecord":
+        return cls(
+            id=row["id"],
+            profile_id=row["profile_id"],
+            envelope_id=row.get("envelope_id"),
+            name=row["name"],
+            target_amount=float(row["target_amount"]),
+            current_balance=float(row.get("current_balance") or 0),
+            target_date=_parse_date(row["target_date"]),
+            monthly_contribution=float(row.get("monthly_contribution") or 0),
+        )
+
+
+def to_records(record_cls: Type[R], rows: Iterable[Dict[str, Any]]) -> List[R]:
+    """Convert PostgREST rows to records, ignoring columns the record doesn't carry."""
+    from_row = record_cls.from_row
+    return [from_row(row) for row in rows]
+
+
+def to_arrays(records: List[Any], *columns: str) -> Dict[str, np.ndarray]:
+    """
+    Columns of a list of records as parallel arrays, for numeric routines.
+    
+    Defaults to every numeric field of the record type.
+    """
+    if not columns:
+        if not records:
+            return {}
+        columns = tuple(
+            f.name for f in fields(records[0]) if f.type in (float, int, "float", "int")
+        )
+    return {
+        column: np.array([getattr(r, column) for r in records])
+        for column in columns
+    }
@@ -1,18 +1,138 @@
 """
 Supabase client for the finance application.
 """
+import asyncio
+import json
 import os
-from typing import Optional, Dict, Any, List
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional, Dict, Any, Callable, List, Set, Tuple
 from datetime import date, datetime
+from urllib.parse import quote
+import httpx
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from supabase import AsyncClient
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Load environment variables
 load_dotenv()
 
+
+def _json_dumps(payload: Any) -> bytes:
+    """Encode a request body, with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(payload).encode()
+
+
+def _json_loads(content: bytes) -> Any:
+    """Decode a response body, with orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _iso(value: Any) -> Any:
+    """Serialize a date for PostgREST, passing through strings and None."""
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _filter_value(value: Any) -> str:
+    """Format a value for a PostgREST eq filter in a query string."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return quote(str(value), safe="")
+
+
+# Insert columns per table as (column, cast, default); a cast of None passes values through
+_SCHEMAS: Dict[str, Tuple[Tuple[str, Optional[Callable[[Any], Any]], Any], ...]] = {
+    "envelopes": (
+        ("category", None, None),
+        ("name", None, None),
+        ("target_amount", float, 0.0),
+        ("current_balance", float, 0.0),
+        ("priority", None, 10),
+    ),
+    "bills": (
+        ("envelope_id", None, None),
+        ("name", None, None),
+        ("amount", float, 0.0),
+        ("bill_type", None, None),
+        ("due_date", _iso, None),
+        ("paid", None, False),
+    ),
+    "debts": (
+        ("envelope_id", None, None),
+        ("name", None, None),
+        ("balance", float, 0.0),
+        ("apr", float, 0.0),
+        ("minimum_payment", float, 0.0),
+        ("due_date", _iso, None),
+        ("strategy", None, None),
+        ("paid_off", None, False),
+    ),
+    "sinking_funds": (
+        ("envelope_id", None, None),
+        ("name", None, None),
+        ("target_amount", float, 0.0),
+        ("current_balance", float, 0.0),
+        ("deadline", _iso, None),
+    ),
+    "savings_goals": (
+        ("envelope_id", None, None),
+        ("name", None, None),
+        ("target_amount", float, 0.0),
+        ("current_balance", float, 0.0),
+        ("target_date", _iso, None),
+        ("monthly_contribution", float, 0.0),
+    ),
+    "budget_settings": (
+        ("checking_buffer", float, 500.00),
+        ("emergency_fund_target", float, 10000.00),
+        ("debt_strategy", None, "AVALANCHE"),
+        ("savings_rate", float, 0.20),
+        ("discretionary_percentage", float, 0.30),
+        ("round_to_nearest", float, 10.00),
+    ),
+}
+
+
+def _normalize(table_name: str, row: Dict[str, Any]) -> Dict[str, Any]:
+    """Coerce a row's fields to their insert types, filling defaults for missing ones."""
+    return {
+        column: default if (value := row.get(column)) is None else value if cast is None else cast(value)
+        for column, cast, default in _SCHEMAS[table_name]
+    }
+
+
 class SupabaseClient:
     """Supabase client wrapper."""
     
+    # Kept-alive connections for PostgREST calls, sized under Supabase's connection cap
+    HTTP_LIMITS = httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=1800)
+    HTTP_TIMEOUT = httpx.Timeout(30.0)
+    
+    # Rows per insert request in the bulk helpers, under PostgREST's payload limits
+    BULK_INSERT_SIZE = 500
+    
+    # Rarely-changing lookups are served from memory for this many seconds
+    CACHE_TTL = 30
+    CACHE_SIZE = 1024
+    
+    # Seconds a connection check result is reused for
+    CONNECTION_CHECK_TTL = 10
+    
     def __init__(self):
         self.url: str = os.getenv("SUPABASE_URL")
         self.key: str = os.getenv("SUPABASE_KEY")
@@ -22,21 +142,150 @@ class SupabaseClient:
             raise ValueError("Supabase URL and key must be set in environment variables")
         
         self.client: Client = create_client(self.url, self.key)
+        self._use_pooled_session()
+        # Shared by every session thread of the app, so writes go under the lock
+        self._cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self._cache_lock = threading.Lock()
+        self._query_templates: Dict[Tuple[str, Tuple[str, ...]], str] = {}
+        self._connection_checked: Tuple[float, bool] = (0.0, False)
+        
+        # Reads in flight, so concurrent identical reads share one request
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Async clients and tasks are bound to the event loop that made them,
+        # so each loop (e.g. each asyncio.run) gets its own
+        self._ainflight: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    
+    def _use_pooled_session(self):
+        """
+        Give every PostgREST client this client builds a pooled HTTP session.
+        
+        supabase-py drops its PostgREST client on sign-in and token refresh and
+        builds a new one on next use, so the swap is hooked into that factory
+        as well as applied to the current client.
+        """
+        init_postgrest = getattr(self.client, "_init_postgrest_client", None)
+        if init_postgrest is not None:
+            self.client._init_postgrest_client = (
+                lambda *args, **kwargs: self._pool_session(init_postgrest(*args, **kwargs))
+            )
+        self._pool_session(self.client.postgrest)
+    
+    def _pool_session(self, postgrest):
+        """
+        Swap a PostgREST client's HTTP session for one with explicit pool limits.
+        
+        Everything else matches the session postgrest built: HTTP/2, redirects,
+        auth, TLS verification and proxy settings carry over.
+        """
+        session = postgrest.session
+        if getattr(postgrest, "_pooled_session", None) is session:
+            return postgrest
+        
+        postgrest.session = httpx.Client(
+            base_url=session.base_url,
+            headers=session.headers,
+            cookies=session.cookies,
+            params=session.params,
+            auth=session.auth,
+            follow_redirects=session.follow_redirects,
+            max_redirects=session.max_redirects,
+            event_hooks=session.event_hooks,
+            trust_env=session.trust_env,
+            verify=getattr(postgrest, "verify", True),
+            proxy=getattr(postgrest, "proxy", None),
+            http2=True,
+            limits=self.HTTP_LIMITS,
+            timeout=self.HTTP_TIMEOUT,
+        )
+        postgrest._pooled_session = postgrest.session
+        session.close()
+        return postgrest
+    
+    def _cached(self, key: Tuple[str, str], fetch: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        Return a fresh cached lookup or fetch it; missing rows are not cached.
+        
+        The cached row is shared with every caller, so it must not be mutated.
+        """
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        
+        # Fetched outside the lock so a slow request doesn't block other lookups
+        value = fetch()
+        if value is not None:
+            with self._cache_lock:
+                self._cache.pop(key, None)
+                if len(self._cache) >= self.CACHE_SIZE:
+                    del self._cache[next(iter(self._cache))]
+                self._cache[key] = (now + self.CACHE_TTL, value)
+        return value
+    
+    def _uncache(self, *keys: Tuple[str, str]) -> None:
+        """Drop cached lookups after a write."""
+        with self._cache_lock:
+            for key in keys:
+                self._cache.pop(key, None)
+    
+    def _select_eq(self, table_name: str, **filters: Any) -> List[Dict[str, Any]]:
+        """
+        Select all rows of a table matching equality filters.
+        
+        Goes straight to the PostgREST session with a path template prepared
+        once per table and filter columns, skipping the query builder.
+        """
+        key = (table_name, tuple(filters))
+        template = self._query_templates.get(key)
+        if template is None:
+            conditions = "".join(f"&{column}=eq.{{}}" for column in filters)
+            template = self._query_templates[key] = f"/{table_name}?select=*{conditions}"
+        
+        path = template.format(*[_filter_value(value) for value in filters.values()])
+        with self._inflight_lock:
+            future = self._inflight.get(path)
+            leader = future is None
+            if leader:
+                future = self._inflight[path] = Future()
+        
+        if not leader:
+            return list(future.result())
+        
+        try:
+            response = self.client.postgrest.session.get(path)
+            response.raise_for_status()
+            rows = _json_loads(response.content)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(rows)
+            return rows
+        finally:
+            with self._inflight_lock:
+                del self._inflight[path]
+    
+    def _fetch_one(self, table_name: str, column: str, value: str) -> Optional[Dict[str, Any]]:
+        """Fetch the first row of a table matching one column."""
+        rows = self._select_eq(table_name, **{column: value})
+        return rows[0] if rows else None
     
     # User operations
     def create_user(self, email: str) -> Dict[str, Any]:
         """Create a new user."""
+        self._uncache(("user", email))
         return self.client.table("users").insert({"email": email}).execute()
     
     def get_user(self, email: str) -> Optional[Dict[str, Any]]:
-        """Get user by email."""
-        response = self.client.table("users").select("*").eq("email", email).execute()
-        return response.data[0] if response.data else None
+        """Get user by email (cached and shared: don't mutate the row)."""
+        return self._cached(("user", email), lambda: self._fetch_one("users", "email", email))
     
     def get_user_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
-        """Get user by ID."""
-        response = self.client.table("users").select("*").eq("id", user_id).execute()
-        return response.data[0] if response.data else None
+        """Get user by ID (cached and shared: don't mutate the row)."""
+        return self._cached(("user_id", user_id), lambda: self._fetch_one("users", "id", user_id))
     
     # Budget profile operations
     def create_budget_profile(self, user_id: str, name: str = "Default") -> Dict[str, Any]:
@@ -47,45 +296,73 @@ class SupabaseClient:
         }).execute()
     
     def get_budget_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
-        """Get budget profile by ID."""
-        response = self.client.table("budget_profiles").select("*").eq("id", profile_id).execute()
-        return response.data[0] if response.data else None
+        """Get budget profile by ID (cached and shared: don't mutate the row)."""
+        return self._cached(
+            ("budget_profile", profile_id), lambda: self._fetch_one("budget_profiles", "id", profile_id)
+        )
     
     def get_user_budget_profiles(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all budget profiles for a user."""
-        response = self.client.table("budget_profiles").select("*").eq("user_id", user_id).execute()
-        return response.data
+        return self._select_eq("budget_profiles", user_id=user_id)
     
     def update_budget_profile(self, profile_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a budget profile."""
-        return self.client.table("budget_profiles").update(data).eq("id", profile_id).execute()
+        result = self.client.table("budget_profiles").update(data).eq("id", profile_id).execute()
+        self._uncache(("budget_profile", profile_id))
+        return result
     
     def delete_budget_profile(self, profile_id: str) -> Dict[str, Any]:
         """Delete a budget profile."""
-        return self.client.table("budget_profiles").delete().eq("id", profile_id).execute()
+        result = self.client.table("budget_profiles").delete().eq("id", profile_id).execute()
+        self._uncache(("budget_profile", profile_id), ("budget_settings", profile_id))
+        return result
+    
+    def get_profile_bundle(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a profile with its envelopes, unpaid bills, open debts, sinking funds,
+        savings goals and settings in one request.
+        
+        Related tables are embedded through their profile_id foreign keys; the
+        hints keep PostgREST from also matching the envelope_id links.
+        """
+        response = self.client.table("budget_profiles").select(
+            "*,"
+            "envelopes!profile_id(*),"
+            "bills!profile_id(*),"
+            "debts!profile_id(*),"
+            "sinking_funds!profile_id(*),"
+            "savings_goals!profile_id(*),"
+            "budget_settings!profile_id(*)"
+        ).eq("id", profile_id).eq("bills.paid", False).eq("debts.paid_off", False).execute()
+        if not response.data:
+            return None
+        
+        bundle = response.data[0]
+        
+        # One-to-one embeds come back as an object or a one-item list depending on the server
+        settings = bundle.get("budget_settings")
+        if isinstance(settings, list):
+            bundle["budget_settings"] = settings[0] if settings else None
+        return bundle
     
     # Envelope operations
     def create_envelope(self, profile_id: str, envelope_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new envelope."""
-        data = {
-            "profile_id": profile_id,
-            "category": envelope_data.get("category"),
-            "name": envelope_data.get("name"),
-            "target_amount": float(envelope_data.get("target_amount", 0)),
-            "current_balance": float(envelope_data.get("current_balance", 0)),
-            "priority": envelope_data.get("priority", 10)
-        }
+        data = {"profile_id": profile_id, **_normalize("envelopes", envelope_data)}
         return self.client.table("envelopes").insert(data).execute()
     
+    def create_envelopes_bulk(self, profile_id: str, envelopes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many envelopes, one insert request per batch."""
+        rows = [{"profile_id": profile_id, **_normalize("envelopes", e)} for e in envelopes]
+        return self._insert_bulk("envelopes", rows)
+    
     def get_envelopes(self, profile_id: str) -> List[Dict[str, Any]]:
         """Get all envelopes for a profile."""
-        response = self.client.table("envelopes").select("*").eq("profile_id", profile_id).execute()
-        return response.data
+        return self._select_eq("envelopes", profile_id=profile_id)
     
     def get_envelope(self, envelope_id: str) -> Optional[Dict[str, Any]]:
         """Get envelope by ID."""
-        response = self.client.table("envelopes").select("*").eq("id", envelope_id).execute()
-        return response.data[0] if response.data else None
+        return self._fetch_one("envelopes", "id", envelope_id)
     
     def update_envelope(self, envelope_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update an envelope."""
@@ -98,34 +375,30 @@ class SupabaseClient:
     # Bill operations
     def create_bill(self, profile_id: str, bill_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new bill."""
-        due_date = bill_data.get("due_date")
-        if isinstance(due_date, date):
-            due_date = due_date.isoformat()
-        
-        data = {
-            "profile_id": profile_id,
-            "envelope_id": bill_data.get("envelope_id"),
-            "name": bill_data.get("name"),
-            "amount": float(bill_data.get("amount", 0)),
-            "bill_type": bill_data.get("bill_type"),
-            "due_date": due_date,
-            "paid": bill_data.get("paid", False)
-        }
+        data = {"profile_id": profile_id, **_normalize("bills", bill_data)}
         return self.client.table("bills").insert(data).execute()
     
+    def create_bills_bulk(self, profile_id: str, bills: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many bills, one insert request per batch."""
+        rows = [{"profile_id": profile_id, **_normalize("bills", b)} for b in bills]
+        return self._insert_bulk("bills", rows)
+    
     def get_bills(self, profile_id: str, paid: bool = None) -> List[Dict[str, Any]]:
         """Get bills for a profile."""
-        query = self.client.table("bills").select("*").eq("profile_id", profile_id)
-        if paid is not None:
-            query = query.eq("paid", paid)
+        if paid is None:
+            return self._select_eq("bills", profile_id=profile_id)
+        return self._select_eq("bills", profile_id=profile_id, paid=paid)
+    
+    def get_upcoming_bills(
+        self, profile_id: str, start_date: date, end_date: date, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Get unpaid bills due between start_date and end_date, soonest first, at most limit of them."""
+        query = self.client.table("bills").select("*").eq("profile_id", profile_id).eq("paid", False).gte("due_date", start_date.isoformat()).lte("due_date", end_date.isoformat()).order("due_date")
+        if limit is not None:
+            query = query.limit(limit)
         response = query.execute()
         return response.data
     
-    def get_upcoming_bills(self, profile_id: str, start_date: date, end_date: date) -> List[Dict[str, Any]]:
-        """Get bills due between start_date and end_date."""
-        response = self.client.table("bills").select("*").eq("profile_id", profile_id).eq("paid", False).gte("due_date", start_date.isoformat()).lte("due_date", end_date.isoformat()).execute()
-        return response.data
-    
     def update_bill(self, bill_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a bill."""
         return self.client.table("bills").update(data).eq("id", bill_id).execute()
@@ -137,27 +410,17 @@ class SupabaseClient:
     # Debt operations
     def create_debt(self, profile_id: str, debt_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new debt."""
-        due_date = debt_data.get("due_date")
-        if isinstance(due_date, date):
-            due_date = due_date.isoformat()
-        
-        data = {
-            "profile_id": profile_id,
-            "envelope_id": debt_data.get("envelope_id"),
-            "name": debt_data.get("name"),
-            "balance": float(debt_data.get("balance", 0)),
-            "apr": float(debt_data.get("apr", 0)),
-            "minimum_payment": float(debt_data.get("minimum_payment", 0)),
-            "due_date": due_date,
-            "strategy": debt_data.get("strategy"),
-            "paid_off": debt_data.get("paid_off", False)
-        }
+        data = {"profile_id": profile_id, **_normalize("debts", debt_data)}
         return self.client.table("debts").insert(data).execute()
     
+    def create_debts_bulk(self, profile_id: str, debts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Create many debts, one insert request per batch."""
+        rows = [{"profile_id": profile_id, **_normalize("debts", d)} for d in debts]
+        return self._insert_bulk("debts", rows)
+    
     def get_debts(self, profile_id: str, paid_off: bool = False) -> List[Dict[str, Any]]:
         """Get debts for a profile."""
-        response = self.client.table("debts").select("*").eq("profile_id", profile_id).eq("paid_off", paid_off).execute()
-        return response.data
+        return self._select_eq("debts", profile_id=profile_id, paid_off=paid_off)
     
     def update_debt(self, debt_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a debt."""
@@ -170,24 +433,12 @@ class SupabaseClient:
     # Sinking fund operations
     def create_sinking_fund(self, profile_id: str, fund_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new sinking fund."""
-        deadline = fund_data.get("deadline")
-        if isinstance(deadline, date):
-            deadline = deadline.isoformat()
-        
-        data = {
-            "profile_id": profile_id,
-            "envelope_id": fund_data.get("envelope_id"),
-            "name": fund_data.get("name"),
-            "target_amount": float(fund_data.get("target_amount", 0)),
-            "current_balance": float(fund_data.get("current_balance", 0)),
-            "deadline": deadline
-        }
+        data = {"profile_id": profile_id, **_normalize("sinking_funds", fund_data)}
         return self.client.table("sinking_funds").insert(data).execute()
     
     def get_sinking_funds(self, profile_id: str) -> List[Dict[str, Any]]:
         """Get sinking funds for a profile."""
-        response = self.client.table("sinking_funds").select("*").eq("profile_id", profile_id).execute()
-        return response.data
+        return self._select_eq("sinking_funds", profile_id=profile_id)
     
     def update_sinking_fund(self, fund_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a sinking fund."""
@@ -200,25 +451,12 @@ class SupabaseClient:
     # Savings goal operations
     def create_savings_goal(self, profile_id: str, goal_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new savings goal."""
-        target_date = goal_data.get("target_date")
-        if isinstance(target_date, date):
-            target_date = target_date.isoformat()
-        
-        data = {
-            "profile_id": profile_id,
-            "envelope_id": goal_data.get("envelope_id"),
-            "name": goal_data.get("name"),
-            "target_amount": float(goal_data.get("target_amount", 0)),
-            "current_balance": float(goal_data.get("current_balance", 0)),
-            "target_date": target_date,
-            "monthly_contribution": float(goal_data.get("monthly_contribution", 0))
-        }
+        data = {"profile_id": profile_id, **_normalize("savings_goals", goal_data)}
         return self.client.table("savings_goals").insert(data).execute()
     
     def get_savings_goals(self, profile_id: str) -> List[Dict[str, Any]]:
         """Get savings goals for a profile."""
-        response = self.client.table("savings_goals").select("*").eq("profile_id", profile_id).execute()
-        return response.data
+        return self._select_eq("savings_goals", profile_id=profile_id)
     
     def update_savings_goal(self, goal_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update a savings goal."""
@@ -231,43 +469,162 @@ class SupabaseClient:
     # Settings operations
     def create_budget_settings(self, profile_id: str, settings_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create budget settings for a profile."""
-        data = {
-            "profile_id": profile_id,
-            "checking_buffer": float(settings_data.get("checking_buffer", 500.00)),
-            "emergency_fund_target": float(settings_data.get("emergency_fund_target", 10000.00)),
-            "debt_strategy": settings_data.get("debt_strategy", "AVALANCHE"),
-            "savings_rate": float(settings_data.get("savings_rate", 0.20)),
-            "discretionary_percentage": float(settings_data.get("discretionary_percentage", 0.30)),
-            "round_to_nearest": float(settings_data.get("round_to_nearest", 10.00))
-        }
-        return self.client.table("budget_settings").insert(data).execute()
+        data = {"profile_id": profile_id, **_normalize("budget_settings", settings_data)}
+        result = self.client.table("budget_settings").insert(data).execute()
+        self._uncache(("budget_settings", profile_id))
+        return result
     
     def get_budget_settings(self, profile_id: str) -> Optional[Dict[str, Any]]:
-        """Get budget settings for a profile."""
-        response = self.client.table("budget_settings").select("*").eq("profile_id", profile_id).execute()
-        return response.data[0] if response.data else None
+        """Get budget settings for a profile (cached and shared: don't mutate the row)."""
+        return self._cached(
+            ("budget_settings", profile_id), lambda: self._fetch_one("budget_settings", "profile_id", profile_id)
+        )
     
     def update_budget_settings(self, profile_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Update budget settings for a profile."""
-        return self.client.table("budget_settings").update(data).eq("profile_id", profile_id).execute()
+        result = self.client.table("budget_settings").update(data).eq("profile_id", profile_id).execute()
+        self._uncache(("budget_settings", profile_id))
+        return result
     
     # Helper methods
+    def _insert_bulk(self, table_name: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert rows in BULK_INSERT_SIZE batches and return the created rows."""
+        session = self.client.postgrest.session
+        headers = {"Content-Type": "application/json", "Prefer": "return=representation"}
+        created = []
+        for start in range(0, len(rows), self.BULK_INSERT_SIZE):
+            response = session.post(
+                f"/{table_name}", content=_json_dumps(rows[start:start + self.BULK_INSERT_SIZE]), headers=headers
+            )
+            response.raise_for_status()
+            created.extend(_json_loads(response.content))
+        return created
+    
     def delete_item(self, table_name: str, item_id: str) -> Dict[str, Any]:
         """Delete an item from any table."""
-        return self.client.table(table_name).delete().eq("id", item_id).execute()
+        result = self.client.table(table_name).delete().eq("id", item_id).execute()
+        
+        # Cached lookups aren't keyed by row ID for every table, so drop them all
+        if table_name in ("users", "budget_profiles", "budget_settings"):
+            with self._cache_lock:
+                self._cache.clear()
+        return result
+    
+    # Async reads, for callers that need several tables at once
+    async def _aclient(self) -> "AsyncClient":
+        """Get the async client for the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            # Imported here so supabase releases without the async client can
+            # still load this module for the sync API
+            from supabase import acreate_client
+            client = self._async_clients[loop] = await acreate_client(self.url, self.key)
+        return client
+    
+    async def _aselect(self, table_name: str, **filters: Any) -> List[Dict[str, Any]]:
+        """Select all rows of a table matching equality filters, sharing identical reads in flight."""
+        key = (table_name, *filters.items())
+        inflight = self._ainflight.setdefault(asyncio.get_running_loop(), {})
+        task = inflight.get(key)
+        if task is None:
+            task = inflight[key] = asyncio.ensure_future(self._aselect_fetch(table_name, filters))
+            task.add_done_callback(lambda _: inflight.pop(key, None))
+        
+        # Shielded so one caller being cancelled doesn't cancel the read for the others
+        return list(await asyncio.shield(task))
+    
+    async def _aselect_fetch(self, table_name: str, filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Run a select for _aselect."""
+        query = (await self._aclient()).table(table_name).select("*")
+        for column, value in filters.items():
+            query = query.eq(column, value)
+        response = await query.execute()
+        return response.data
+    
+    async def aget_envelopes(self, profile_id: str) -> List[Dict[str, Any]]:
+        """Get all envelopes for a profile."""
+        return await self._aselect("envelopes", profile_id=profile_id)
+    
+    async def aget_bills(self, profile_id: str, paid: bool = None) -> List[Dict[str, Any]]:
+        """Get bills for a profile."""
+        if paid is None:
+            return await self._aselect("bills", profile_id=profile_id)
+        return await self._aselect("bills", profile_id=profile_id, paid=paid)
+    
+    async def aget_debts(self, profile_id: str, paid_off: bool = False) -> List[Dict[str, Any]]:
+        """Get debts for a profile."""
+        return await self._aselect("debts", profile_id=profile_id, paid_off=paid_off)
+    
+    async def aget_sinking_funds(self, profile_id: str) -> List[Dict[str, Any]]:
+        """Get sinking funds for a profile."""
+        return await self._aselect("sinking_funds", profile_id=profile_id)
+    
+    async def aget_savings_goals(self, profile_id: str) -> List[Dict[str, Any]]:
+        """Get savings goals for a profile."""
+        return await self._aselect("savings_goals", profile_id=profile_id)
+    
+    async def aget_budget_settings(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """Get budget settings for a profile."""
+        rows = await self._aselect("budget_settings", profile_id=profile_id)
+        return rows[0] if rows else None
+    
+    async def aget_bundle(self, profile_id: str) -> Dict[str, Any]:
+        """Get a profile's envelopes, unpaid bills, open debts, funds, goals and settings concurrently."""
+        envelopes, bills, debts, sinking_funds, savings_goals, settings = await asyncio.gather(
+            self.aget_envelopes(profile_id),
+            self.aget_bills(profile_id, paid=False),
+            self.aget_debts(profile_id, paid_off=False),
+            self.aget_sinking_funds(profile_id),
+            self.aget_savings_goals(profile_id),
+            self.aget_budget_settings(profile_id),
+        )
+        return {
+            "envelopes": envelopes,
+            "bills": bills,
+            "debts": debts,
+            "sinking_funds": sinking_funds,
+            "savings_goals": savings_goals,
+            "budget_settings": settings,
+        }
+    
+    def list_tables(self) -> Set[str]:
+        """
+        Names of the tables PostgREST exposes, from a single request.
+        
+        information_schema isn't reachable over REST, but the PostgREST root
+        serves an OpenAPI description with one path per exposed table.
+        """
+        response = self.client.postgrest.session.get("/")
+        response.raise_for_status()
+        paths = _json_loads(response.content).get("paths", {})
+        return {path[1:] for path in paths if path != "/" and not path.startswith("/rpc/")}
     
     def test_connection(self) -> bool:
         """Test the Supabase connection."""
+        expires, connected = self._connection_checked
+        if time.monotonic() < expires:
+            return connected
+        
+        # A HEAD request with a count proves connectivity without sending any rows
         try:
-            response = self.client.table("users").select("*").limit(1).execute()
-            return True
+            self.client.table("users").select("id", head=True, count="exact").execute()
+            connected = True
         except Exception as e:
             print(f"Supabase connection test failed: {str(e)}")
-            return False
+            connected = False
+        
+        self._connection_checked = (time.monotonic() + self.CONNECTION_CHECK_TTL, connected)
+        return connected
+
+@lru_cache(maxsize=None)
+def get_supabase_client() -> SupabaseClient:
+    """Get the shared client, so its warm connections are reused across reruns."""
+    return SupabaseClient()
 
 # Singleton instance
 try:
-    supabase_client = SupabaseClient()
+    supabase_client = get_supabase_client()
 except Exception as e:
     print(f"Failed to initialize Supabase client: {str(e)}")
     supabase_client = None
\ No newline at end of file
@@ -82,6 +82,15 @@ def print_supabase_instructions():
     print("   Use app/main_supabase.py as a reference")
     print("   Or update app/main.py to use the Supabase client")
 
+def _mask_url(url: str) -> str:
+    """Replace the password in a database URL with ***."""
+    credentials, at, host = url.rpartition('@')
+    scheme, slashes, userinfo = credentials.rpartition('//')
+    user, colon, _ = userinfo.partition(':')
+    if not at or not colon:
+        return url
+    return f"{scheme}{slashes}{user}:***{at}{host}"
+
 def check_environment():
     """Check if environment variables are set."""
     print("🔍 Checking environment variables...")
@@ -97,8 +106,7 @@ def check_environment():
                 print(f"      Value: {value[:30]}...")
             elif var == 'DATABASE_URL':
                 # Hide password in output
-                safe_url = value.replace(os.getenv('DATABASE_URL', '').split('@')[0].split(':')[2], '***')
-                print(f"      Value: {safe_url}")
+                print(f"      Value: {_mask_url(value)}")
         else:
             print(f"   ❌ {var}: Missing")
             all_set = False
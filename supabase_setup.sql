@@ -109,6 +109,7 @@ CREATE TABLE IF NOT EXISTS budget_settings (
 CREATE INDEX IF NOT EXISTS idx_envelopes_profile_id ON envelopes(profile_id);
 CREATE INDEX IF NOT EXISTS idx_bills_profile_id ON bills(profile_id);
 CREATE INDEX IF NOT EXISTS idx_bills_due_date ON bills(due_date);
+CREATE INDEX IF NOT EXISTS idx_bills_profile_paid_due_date ON bills(profile_id, paid, due_date);
 CREATE INDEX IF NOT EXISTS idx_debts_profile_id ON debts(profile_id);
 CREATE INDEX IF NOT EXISTS idx_sinking_funds_profile_id ON sinking_funds(profile_id);
 CREATE INDEX IF NOT EXISTS idx_savings_goals_profile_id ON savings_goals(profile_id);
@@ -2,20 +2,115 @@
 Tax calculator for Canadian federal and provincial income tax, CPP, EI, QPP, QPIP.
 """
 import math
-from typing import Dict, List, Optional, Tuple
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple, Any
 from decimal import Decimal, ROUND_HALF_UP
+import numpy as np
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 from .models import (
     TaxTableSet, TaxCalculationResult, UserTaxProfile, 
     Province, PaySchedule, JurisdictionTaxData, CPPEIData
 )
 
 
+# Pay periods per year for each pay schedule
+_PAY_PERIODS = {
+    PaySchedule.WEEKLY: 52,
+    PaySchedule.BIWEEKLY: 26,
+    PaySchedule.SEMIMONTHLY: 24,
+    PaySchedule.MONTHLY: 12
+}
+
+
+class _BracketTable(NamedTuple):
+    """Flattened brackets for one jurisdiction, precomputed for lookup."""
+    thresholds: List[float]
+    upper: List[float]  # Next bracket's threshold, inf for the top bracket
+    rates: List[float]
+    tax_below: List[float]  # Tax on all income below each bracket's threshold
+    
+    # The same columns as float64 arrays for batch calculations
+    threshold_array: np.ndarray
+    rate_array: np.ndarray
+    tax_below_array: np.ndarray
+
+
+def _build_bracket_table(jurisdiction_data: JurisdictionTaxData) -> _BracketTable:
+    """Flatten a jurisdiction's brackets into parallel lists."""
+    brackets = jurisdiction_data.brackets
+    thresholds = [b.threshold for b in brackets]
+    upper = thresholds[1:] + [float('inf')]
+    rates = [b.rate for b in brackets]
+    
+    # Accumulated in bracket order, as the per-bracket loop added them
+    tax_below = []
+    tax = 0.0
+    for threshold, next_threshold, rate in zip(thresholds, upper, rates):
+        tax_below.append(tax)
+        width = next_threshold - threshold
+        if width > 0:
+            tax += width * rate
+    
+    threshold_array, rate_array = jurisdiction_data.bracket_arrays()
+    tax_below_array = np.array(tax_below, dtype=np.float64)
+    for array in (threshold_array, rate_array, tax_below_array):
+        array.flags.writeable = False
+    
+    return _BracketTable(
+        thresholds, upper, rates, tax_below, threshold_array, rate_array, tax_below_array
+    )
+
+
+def _bracket_tax_numpy(
+    taxable_income: np.ndarray, thresholds: np.ndarray, rates: np.ndarray, tax_below: np.ndarray
+) -> np.ndarray:
+    """Progressive bracket tax on an array of taxable incomes."""
+    if not len(thresholds):
+        return np.zeros_like(taxable_income)
+    
+    i = np.searchsorted(thresholds, taxable_income, side='right') - 1
+    
+    # Income below the first threshold is untaxed
+    in_brackets = i >= 0
+    i = np.maximum(i, 0)
+    return np.where(in_brackets, tax_below[i] + (taxable_income - thresholds[i]) * rates[i], 0.0)
+
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, parallel=True)
+    def _bracket_tax(taxable_income, thresholds, rates, tax_below):
+        """Compiled _bracket_tax_numpy, one parallel pass over the incomes."""
+        tax = np.zeros_like(taxable_income)
+        for k in numba.prange(taxable_income.shape[0]):
+            i = np.searchsorted(thresholds, taxable_income[k], side='right') - 1
+            if i >= 0:
+                tax[k] = tax_below[i] + (taxable_income[k] - thresholds[i]) * rates[i]
+        return tax
+else:
+    _bracket_tax = _bracket_tax_numpy
+
+
 class TaxCalculator:
     """Calculator for Canadian income tax and deductions."""
     
+    # Annual results kept for repeat paycheck calculations (oldest evicted first)
+    ANNUAL_CACHE_SIZE = 1024
+    
     def __init__(self, tax_tables: TaxTableSet):
         self.tax_tables = tax_tables
         self.year = tax_tables.year
+        # Annual results with their rounded typical paycheck, by _annual_tax_key
+        self._annual_cache: Dict[Tuple[Any, ...], Tuple[TaxCalculationResult, Dict[str, float]]] = {}
+        
+        # Bracket tables by id(jurisdiction data), holding the data to guard against id reuse
+        self._bracket_tables: Dict[int, Tuple[JurisdictionTaxData, _BracketTable]] = {}
+        for jurisdiction_data in [tax_tables.federal, *tax_tables.provincial.values()]:
+            self._bracket_table(jurisdiction_data)
         
     def calculate_annual_tax(self, profile: UserTaxProfile) -> TaxCalculationResult:
         """
@@ -101,6 +196,84 @@ class TaxCalculator:
             provincial_breakdown=provincial_breakdown
         )
     
+    def calculate_annual_tax_batch(self, incomes: np.ndarray, province: Province) -> Dict[str, np.ndarray]:
+        """
+        Calculate annual tax and deductions for many incomes in one pass.
+        
+        Equivalent to calculate_annual_tax for profiles with no additional
+        claims or withholding, without building a result per income.
+        
+        Args:
+            incomes: Annual gross incomes
+            province: Province of residence
+            
+        Returns:
+            Dictionary of arrays aligned with incomes, rounded to cents
+        """
+        incomes = np.asarray(incomes, dtype=float)
+        
+        provincial_data = self.tax_tables.provincial.get(province.value)
+        if not provincial_data:
+            raise ValueError(f"No tax data for province {province.value} in year {self.year}")
+        
+        federal_tax = self._jurisdiction_tax_batch(incomes, self.tax_tables.federal)
+        provincial_tax = self._jurisdiction_tax_batch(incomes, provincial_data)
+        
+        cpp_data = self.tax_tables.cpp_ei
+        pensionable = np.maximum(0, incomes - cpp_data.cpp_basic_exemption)
+        cpp_contrib = self._round_to_cents_batch(np.minimum(
+            np.minimum(pensionable, cpp_data.cpp_ympe) * cpp_data.cpp_rate, cpp_data.cpp_max_contrib
+        ))
+        ei_contrib = self._round_to_cents_batch(np.minimum(
+            np.minimum(incomes, cpp_data.ei_mie) * cpp_data.ei_rate, cpp_data.ei_max_contrib
+        ))
+        total_tax = federal_tax + provincial_tax + cpp_contrib + ei_contrib
+        
+        result = {
+            "gross_income": incomes,
+            "federal_tax": federal_tax,
+            "provincial_tax": provincial_tax,
+            "cpp_contribution": cpp_contrib,
+            "ei_contribution": ei_contrib,
+        }
+        
+        # Quebec-specific calculations
+        if province == Province.QC:
+            qpp_contrib = np.zeros_like(incomes)
+            if cpp_data.qpp_rate and cpp_data.qpp_ympe:
+                qpp_contrib = np.minimum(pensionable, cpp_data.qpp_ympe) * cpp_data.qpp_rate
+                if cpp_data.qpp_max_contrib:
+                    qpp_contrib = np.minimum(qpp_contrib, cpp_data.qpp_max_contrib)
+                qpp_contrib = self._round_to_cents_batch(qpp_contrib)
+            
+            qpip_contrib = np.zeros_like(incomes)
+            if cpp_data.qpip_rate:
+                qpip_contrib = np.minimum(incomes, cpp_data.ei_mie) * cpp_data.qpip_rate
+                if cpp_data.qpip_max_contrib:
+                    qpip_contrib = np.minimum(qpip_contrib, cpp_data.qpip_max_contrib)
+                qpip_contrib = self._round_to_cents_batch(qpip_contrib)
+            
+            result["qpp_contribution"] = qpp_contrib
+            result["qpip_contribution"] = qpip_contrib
+            total_tax = total_tax + qpp_contrib + qpip_contrib
+        
+        result["total_tax"] = total_tax
+        result["net_income"] = incomes - total_tax
+        return result
+    
+    def _jurisdiction_tax_batch(self, incomes: np.ndarray, jurisdiction_data: JurisdictionTaxData) -> np.ndarray:
+        """Vectorized _calculate_jurisdiction_tax for profiles without claims or withholding."""
+        table = self._bracket_table(jurisdiction_data)
+        taxable_income = np.maximum(0.0, incomes - jurisdiction_data.basic_personal_amount)
+        tax = _bracket_tax(taxable_income, table.threshold_array, table.rate_array, table.tax_below_array)
+        
+        # Apply surtaxes if any
+        if jurisdiction_data.surtaxes:
+            for surtax_rate in jurisdiction_data.surtaxes.values():
+                tax = tax + tax * surtax_rate
+        
+        return self._round_to_cents_batch(tax)
+    
     def _calculate_jurisdiction_tax(
         self, income: float, jurisdiction_data: JurisdictionTaxData, profile: UserTaxProfile
     ) -> float:
@@ -122,22 +295,17 @@ class TaxCalculator:
         for claim_amount in profile.additional_claims.values():
             taxable_income = max(0, taxable_income - claim_amount)
         
-        # Calculate tax using progressive brackets
-        tax = 0.0
-        brackets = jurisdiction_data.brackets
-        
-        for i in range(len(brackets)):
-            current_bracket = brackets[i]
-            next_threshold = brackets[i + 1].threshold if i + 1 < len(brackets) else float('inf')
-            
-            # Income in this bracket
-            bracket_income = min(
-                max(0, taxable_income - current_bracket.threshold),
-                next_threshold - current_bracket.threshold
-            )
-            
+        # Calculate tax using progressive brackets: tax on the brackets below
+        # plus the marginal rate on the income inside the top bracket reached
+        table = self._bracket_table(jurisdiction_data)
+        i = bisect_right(table.thresholds, taxable_income) - 1
+        if i >= 0:
+            tax = table.tax_below[i]
+            bracket_income = taxable_income - table.thresholds[i]
             if bracket_income > 0:
-                tax += bracket_income * current_bracket.rate
+                tax += bracket_income * table.rates[i]
+        else:
+            tax = 0.0
         
         # Apply surtaxes if any
         if jurisdiction_data.surtaxes:
@@ -206,48 +374,85 @@ class TaxCalculator:
         
         return self._round_to_cents(qpip_contrib)
     
-    def _get_bracket_breakdown(self, income: float, jurisdiction_data: JurisdictionTaxData) -> List[Dict[str, float]]:
+    def _get_bracket_breakdown(self, income: float, jurisdiction_data: JurisdictionTaxData) -> List[Dict[str, Optional[float]]]:
         """Get detailed breakdown of tax by bracket."""
         taxable_income = max(0, income - jurisdiction_data.basic_personal_amount)
-        brackets = jurisdiction_data.brackets
+        table = self._bracket_table(jurisdiction_data)
         breakdown = []
         
-        for i in range(len(brackets)):
-            current_bracket = brackets[i]
-            next_threshold = brackets[i + 1].threshold if i + 1 < len(brackets) else float('inf')
-            
+        # Only brackets up to the one containing taxable income hold any of it
+        top = bisect_right(table.thresholds, taxable_income)
+        for threshold, next_threshold, rate in zip(table.thresholds[:top], table.upper, table.rates):
             # Income in this bracket
-            bracket_income = min(
-                max(0, taxable_income - current_bracket.threshold),
-                next_threshold - current_bracket.threshold
-            )
+            bracket_income = min(taxable_income - threshold, next_threshold - threshold)
             
             if bracket_income > 0:
-                tax_in_bracket = bracket_income * current_bracket.rate
+                tax_in_bracket = bracket_income * rate
                 breakdown.append({
-                    "bracket_min": current_bracket.threshold,
+                    "bracket_min": threshold,
                     "bracket_max": next_threshold if next_threshold != float('inf') else None,
                     "income_in_bracket": bracket_income,
-                    "marginal_rate": current_bracket.rate,
+                    "marginal_rate": rate,
                     "tax_in_bracket": tax_in_bracket
                 })
         
         return breakdown
     
+    def _bracket_table(self, jurisdiction_data: JurisdictionTaxData) -> _BracketTable:
+        """Get the precomputed bracket table for a jurisdiction, building it on first use."""
+        entry = self._bracket_tables.get(id(jurisdiction_data))
+        if entry is None or entry[0] is not jurisdiction_data:
+            entry = (jurisdiction_data, _build_bracket_table(jurisdiction_data))
+            self._bracket_tables[id(jurisdiction_data)] = entry
+        return entry[1]
+    
     def _get_pay_periods_per_year(self, pay_schedule: PaySchedule) -> int:
         """Get number of pay periods per year based on schedule."""
-        periods = {
-            PaySchedule.WEEKLY: 52,
-            PaySchedule.BIWEEKLY: 26,
-            PaySchedule.SEMIMONTHLY: 24,
-            PaySchedule.MONTHLY: 12
-        }
-        return periods[pay_schedule]
+        return _PAY_PERIODS[pay_schedule]
     
     def _round_to_cents(self, amount: float) -> float:
         """Round amount to nearest cent using banker's rounding."""
+        # Float arithmetic settles everything that isn't within float error of
+        # a half cent; those, and huge or non-finite amounts, go through Decimal
+        cents = abs(amount) * 100
+        if cents < 1e10:
+            whole = math.floor(cents)
+            fraction = cents - whole
+            if abs(fraction - 0.5) > 1e-5:
+                return math.copysign((whole + (fraction > 0.5)) / 100, amount)
         return float(Decimal(str(amount)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
     
+    def _round_to_cents_batch(self, amounts: np.ndarray) -> np.ndarray:
+        """
+        Round an array to cents, half away from zero like _round_to_cents.
+        
+        Works on binary floats rather than their decimal repr, so amounts
+        sitting exactly on a half cent can land one cent off the scalar path.
+        """
+        return np.sign(amounts) * np.floor(np.abs(amounts) * 100 + 0.5) / 100
+    
+    def _annual_tax_key(self, profile: UserTaxProfile) -> Tuple[Any, ...]:
+        """Hashable fingerprint of everything calculate_annual_tax reads from a profile."""
+        return (
+            tuple(stream.gross_amount for stream in profile.income_streams),
+            profile.province,
+            tuple(profile.additional_claims.values()),
+            profile.additional_tax_withheld,
+            profile.pay_schedule,
+        )
+    
+    def _cached_annual_tax(self, profile: UserTaxProfile) -> Tuple[TaxCalculationResult, Dict[str, float]]:
+        """Get the annual result and rounded typical paycheck for a profile, reusing them across paychecks."""
+        key = self._annual_tax_key(profile)
+        entry = self._annual_cache.get(key)
+        if entry is None:
+            result = self.calculate_annual_tax(profile)
+            typical = {key: self._round_to_cents(value) for key, value in result.per_pay_period.items()}
+            if len(self._annual_cache) >= self.ANNUAL_CACHE_SIZE:
+                del self._annual_cache[next(iter(self._annual_cache))]
+            entry = self._annual_cache[key] = (result, typical)
+        return entry
+    
     def calculate_paycheck_tax(self, profile: UserTaxProfile, paycheck_gross: float) -> Dict[str, float]:
         """
         Calculate tax for a single paycheck (not annualized).
@@ -263,7 +468,7 @@ class TaxCalculator:
         # For simplicity, we'll assume this paycheck represents a typical pay period
         # In a real implementation, you would track YTD amounts
         
-        annual_result = self.calculate_annual_tax(profile)
+        annual_result, typical_paycheck = self._cached_annual_tax(profile)
         pay_period_result = annual_result.per_pay_period
         
         # Scale based on this paycheck's proportion of annual income
@@ -277,8 +482,37 @@ class TaxCalculator:
         else:
             scale_factor = 1.0
         
-        paycheck_result = {}
-        for key, value in pay_period_result.items():
-            paycheck_result[key] = self._round_to_cents(value * scale_factor)
+        # A typical paycheck is the per-period breakdown as already rounded
+        if scale_factor == 1.0:
+            return dict(typical_paycheck)
+        
+        return {
+            key: self._round_to_cents(value * scale_factor)
+            for key, value in pay_period_result.items()
+        }
+    
+    def calculate_paycheck_grid(self, profile: UserTaxProfile, paycheck_grosses: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Calculate calculate_paycheck_tax for many paycheck amounts at once.
+        
+        Args:
+            profile: User tax profile
+            paycheck_grosses: Gross amounts to evaluate
+            
+        Returns:
+            Dictionary of arrays aligned with paycheck_grosses, rounded to cents
+        """
+        paycheck_grosses = np.asarray(paycheck_grosses, dtype=float)
+        annual_result, _ = self._cached_annual_tax(profile)
+        
+        pay_periods = self._get_pay_periods_per_year(profile.pay_schedule)
+        typical_paycheck_gross = annual_result.gross_income / pay_periods
+        if typical_paycheck_gross > 0:
+            scale_factors = paycheck_grosses / typical_paycheck_gross
+        else:
+            scale_factors = np.ones_like(paycheck_grosses)
         
-        return paycheck_result
\ No newline at end of file
+        return {
+            key: self._round_to_cents_batch(value * scale_factors)
+            for key, value in annual_result.per_pay_period.items()
+        }
\ No newline at end of file
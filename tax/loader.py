@@ -4,20 +4,37 @@ Tax tables loader for importing/exporting tax data from JSON/CSV files.
 import json
 import csv
 import os
-from typing import Dict, List, Optional, Any
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from pathlib import Path
 import logging
+import numpy as np
 from .models import (
     TaxTableSet, JurisdictionTaxData, TaxBracket, CPPEIData,
     Province
 )
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Year table files: tax_tables_{year}.json, or the alternative {year}_tax_tables.json
+_YEAR_FILE_PATTERN = re.compile(r'(?:tax_tables_(\d+)|(\d+)_tax_tables)\.json')
+
 
 class TaxTableLoader:
     """Loader for tax table data from various sources."""
     
+    # Parsed table files kept for repeat loads (oldest evicted first)
+    YEAR_CACHE_SIZE = 32
+    
     def __init__(self, data_dir: Optional[str] = None):
         """
         Initialize the loader.
@@ -28,18 +45,31 @@ class TaxTableLoader:
         self.data_dir = data_dir or os.path.join(os.path.dirname(__file__), "..", "data")
         self.data_dir = os.path.abspath(self.data_dir)
         
+        # Parsed tables by file path, with the (mtime, size) they were parsed at
+        self._year_cache: Dict[str, Tuple[Tuple[int, int], TaxTableSet]] = {}
+        self._year_cache_lock = threading.Lock()
+        self._year_paths = self._scan_year_paths()
+        
     def load_from_json(self, filepath: str) -> TaxTableSet:
         """
         Load tax tables from a JSON file.
         
+        The parsed tables are reused until the file's mtime or size changes.
+        
         Args:
             filepath: Path to JSON file
             
         Returns:
             TaxTableSet parsed from JSON
         """
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        return self._load_cached(path, (stat.st_mtime_ns, stat.st_size))
+    
+    def _read_json(self, filepath: str) -> TaxTableSet:
+        """Read and parse a JSON tax table file, bypassing the cache."""
+        content = Path(filepath).read_bytes()
+        data = orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
         
         return self._parse_json_data(data)
     
@@ -53,19 +83,89 @@ class TaxTableLoader:
         Returns:
             TaxTableSet if found, None otherwise
         """
-        # Try to find JSON file for the year
-        json_path = os.path.join(self.data_dir, f"tax_tables_{year}.json")
-        if os.path.exists(json_path):
-            return self.load_from_json(json_path)
-        
-        # Try alternative naming
-        json_path = os.path.join(self.data_dir, f"{year}_tax_tables.json")
-        if os.path.exists(json_path):
-            return self.load_from_json(json_path)
+        # tax_tables_{year}.json always wins, so check it directly in case it
+        # appeared after the last scan; otherwise look the year up in the last
+        # directory scan, rescanning once if it isn't there or its file has gone
+        primary_path = os.path.join(self.data_dir, f"tax_tables_{year}.json")
+        try:
+            stat = os.stat(primary_path)
+        except OSError:
+            pass
+        else:
+            return self._load_cached(primary_path, (stat.st_mtime_ns, stat.st_size))
+        
+        for rescan in (False, True):
+            if rescan:
+                self._year_paths = self._scan_year_paths()
+            json_path = self._year_paths.get(year)
+            if json_path is None:
+                continue
+            try:
+                stat = os.stat(json_path)
+            except OSError:
+                continue
+            return self._load_cached(json_path, (stat.st_mtime_ns, stat.st_size))
         
         logger.warning(f"No tax table file found for year {year}")
         return None
     
+    def load_years(self, years: Iterable[int]) -> Dict[int, TaxTableSet]:
+        """
+        Load tax tables for several years, reading the files in parallel.
+        
+        Years already in the cache are returned without re-reading.
+        
+        Args:
+            years: Tax years to load
+            
+        Returns:
+            Dictionary of TaxTableSet by year; years with no table file are left out
+        """
+        years = list(dict.fromkeys(years))
+        if not years:
+            return {}
+        
+        max_workers = min(len(years), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            loaded = zip(years, executor.map(self.load_year, years))
+            return {year: tables for year, tables in loaded if tables is not None}
+    
+    def _scan_year_paths(self) -> Dict[int, str]:
+        """Map years to their table files in the data directory, preferring tax_tables_{year}.json."""
+        year_paths = {}
+        try:
+            entries = os.scandir(self.data_dir)
+        except OSError:
+            return year_paths
+        
+        with entries:
+            for entry in entries:
+                match = _YEAR_FILE_PATTERN.fullmatch(entry.name)
+                if not match or not entry.is_file():
+                    continue
+                primary, alternative = match.groups()
+                digits = primary or alternative
+                if digits != str(int(digits)):
+                    continue
+                if primary or int(digits) not in year_paths:
+                    year_paths[int(digits)] = entry.path
+        return year_paths
+    
+    def _load_cached(self, json_path: str, signature: Tuple[int, int]) -> TaxTableSet:
+        """Load a tax table file, reusing the parsed tables until the file changes."""
+        entry = self._year_cache.get(json_path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        
+        # Parse outside the lock so load_years can read files concurrently
+        tax_tables = self._read_json(json_path)
+        with self._year_cache_lock:
+            self._year_cache.pop(json_path, None)
+            if len(self._year_cache) >= self.YEAR_CACHE_SIZE:
+                del self._year_cache[next(iter(self._year_cache))]
+            self._year_cache[json_path] = (signature, tax_tables)
+        return tax_tables
+    
     def export_to_json(self, tax_tables: TaxTableSet, filepath: str) -> None:
         """
         Export tax tables to a JSON file.
@@ -79,8 +179,12 @@ class TaxTableLoader:
         # Ensure directory exists
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
     
     def import_from_csv(self, filepath: str, year: int, jurisdiction: str) -> JurisdictionTaxData:
         """
@@ -99,20 +203,37 @@ class TaxTableLoader:
         """
         brackets = []
         basic_personal_amount = 0.0
+        in_order = True
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
+        with open(filepath, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            
+            # Resolve columns once from the header (the last of any duplicates, like DictReader)
+            columns = {name: i for i, name in enumerate(header)}
+            threshold_idx = columns.get('threshold')
+            rate_idx = columns.get('rate')
+            bpa_idx = columns.get('basic_personal_amount')
+            has_brackets = threshold_idx is not None and rate_idx is not None
+            
             for row in reader:
-                if 'threshold' in row and 'rate' in row:
-                    threshold = float(row['threshold'])
-                    rate = float(row['rate'])
+                if not row:
+                    continue
+                
+                # Short rows read as None, failing float() as they did with DictReader
+                if has_brackets:
+                    threshold = float(row[threshold_idx] if threshold_idx < len(row) else None)
+                    rate = float(row[rate_idx] if rate_idx < len(row) else None)
+                    if brackets and threshold < brackets[-1].threshold:
+                        in_order = False
                     brackets.append(TaxBracket(threshold=threshold, rate=rate))
                 
-                if 'basic_personal_amount' in row:
-                    basic_personal_amount = float(row['basic_personal_amount'])
+                if bpa_idx is not None:
+                    basic_personal_amount = float(row[bpa_idx] if bpa_idx < len(row) else None)
         
-        # Sort brackets by threshold
-        brackets.sort(key=lambda b: b.threshold)
+        # Sort brackets by threshold, unless the file already listed them in order
+        if not in_order:
+            brackets.sort(key=attrgetter('threshold'))
         
         return JurisdictionTaxData(
             year=year,
@@ -150,18 +271,39 @@ class TaxTableLoader:
                 if prov_data.year != tax_tables.year:
                     errors.append(f"Province {province.value} year {prov_data.year} doesn't match set year {tax_tables.year}")
         
-        # Check bracket ordering
-        for jurisdiction, data in [("federal", tax_tables.federal)] + list(tax_tables.provincial.items()):
-            thresholds = [b.threshold for b in data.brackets]
-            if thresholds != sorted(thresholds):
+        # Check brackets of every jurisdiction in one pass over their concatenation,
+        # with segment mapping each bracket back to its jurisdiction
+        jurisdictions = [("federal", tax_tables.federal)] + list(tax_tables.provincial.items())
+        counts = [len(data.brackets) for _, data in jurisdictions]
+        total = sum(counts)
+        thresholds = np.fromiter(
+            (b.threshold for _, data in jurisdictions for b in data.brackets), dtype=np.float64, count=total
+        )
+        rates = np.fromiter(
+            (b.rate for _, data in jurisdictions for b in data.brackets), dtype=np.float64, count=total
+        )
+        segment = np.repeat(np.arange(len(jurisdictions)), counts)
+        
+        # Bracket ordering: a drop between neighbours in the same jurisdiction
+        unsorted = np.zeros(len(jurisdictions), dtype=bool)
+        drops = (thresholds[1:] < thresholds[:-1]) & (segment[1:] == segment[:-1])
+        unsorted[segment[1:][drops]] = True
+        
+        # Negative thresholds
+        negative = np.zeros(len(jurisdictions), dtype=bool)
+        negative[segment[thresholds < 0]] = True
+        
+        # Rate bounds
+        bad_rate = np.zeros(len(jurisdictions), dtype=bool)
+        bad_rate[segment[(rates < 0) | (rates > 1)]] = True
+        
+        for k in np.flatnonzero(unsorted | negative | bad_rate):
+            jurisdiction = jurisdictions[k][0]
+            if unsorted[k]:
                 errors.append(f"Brackets not sorted for {jurisdiction}")
-            
-            # Check for negative thresholds
-            if any(b.threshold < 0 for b in data.brackets):
+            if negative[k]:
                 errors.append(f"Negative threshold found in {jurisdiction}")
-            
-            # Check rate bounds
-            if any(b.rate < 0 or b.rate > 1 for b in data.brackets):
+            if bad_rate[k]:
                 errors.append(f"Invalid rate (not between 0 and 1) in {jurisdiction}")
         
         # Check CPP/EI data
@@ -184,118 +326,93 @@ class TaxTableLoader:
         """Parse JSON data into TaxTableSet."""
         year = data["year"]
         
-        # Parse federal data
-        federal_data = self._parse_jurisdiction_data(data["federal"], year, "federal")
-        
-        # Parse provincial data
-        provincial_data = {}
-        for province_code, prov_data in data["provincial"].items():
-            provincial_data[province_code] = self._parse_jurisdiction_data(
-                prov_data, year, province_code
-            )
-        
-        # Parse CPP/EI data
-        cpp_ei_data = self._parse_cpp_ei_data(data["cpp_ei"], year)
-        
-        # Get metadata
-        metadata = data.get("metadata", {})
-        
-        return TaxTableSet(
-            year=year,
-            federal=federal_data,
-            provincial=provincial_data,
-            cpp_ei=cpp_ei_data,
-            metadata=metadata
-        )
+        # Gather every section's fields first so the whole set is validated in
+        # one pass through pydantic's core rather than a constructor per model
+        return TaxTableSet.model_validate({
+            "year": year,
+            "federal": self._jurisdiction_fields(data["federal"], year, "federal"),
+            "provincial": {
+                province_code: self._jurisdiction_fields(prov_data, year, province_code)
+                for province_code, prov_data in data["provincial"].items()
+            },
+            "cpp_ei": self._cpp_ei_fields(data["cpp_ei"], year),
+            "metadata": data.get("metadata", {})
+        })
     
     def _parse_jurisdiction_data(self, data: Dict[str, Any], year: int, jurisdiction: str) -> JurisdictionTaxData:
         """Parse jurisdiction tax data from JSON."""
-        brackets = [
-            TaxBracket(threshold=b["threshold"], rate=b["rate"])
-            for b in data["brackets"]
-        ]
-        
-        return JurisdictionTaxData(
-            year=year,
-            jurisdiction=jurisdiction,
-            brackets=brackets,
-            basic_personal_amount=data["basic_personal_amount"],
-            surtaxes=data.get("surtaxes"),
-            credits=data.get("credits"),
-            metadata=data.get("metadata", {})
-        )
+        return JurisdictionTaxData.model_validate(self._jurisdiction_fields(data, year, jurisdiction))
     
     def _parse_cpp_ei_data(self, data: Dict[str, Any], year: int) -> CPPEIData:
         """Parse CPP/EI data from JSON."""
-        return CPPEIData(
-            year=year,
-            cpp_rate=data["cpp_rate"],
-            cpp_ympe=data["cpp_ympe"],
-            cpp_basic_exemption=data["cpp_basic_exemption"],
-            cpp_max_contrib=data["cpp_max_contrib"],
-            ei_rate=data["ei_rate"],
-            ei_mie=data["ei_mie"],
-            ei_max_contrib=data["ei_max_contrib"],
-            qpp_rate=data.get("qpp_rate"),
-            qpp_ympe=data.get("qpp_ympe"),
-            qpp_max_contrib=data.get("qpp_max_contrib"),
-            qpip_rate=data.get("qpip_rate"),
-            qpip_max_contrib=data.get("qpip_max_contrib")
-        )
+        return CPPEIData.model_validate(self._cpp_ei_fields(data, year))
+    
+    def _jurisdiction_fields(self, data: Dict[str, Any], year: int, jurisdiction: str) -> Dict[str, Any]:
+        """JurisdictionTaxData fields from JSON, with the set's year and key."""
+        # Bracket dicts are validated into TaxBrackets by pydantic's core
+        return {
+            "year": year,
+            "jurisdiction": jurisdiction,
+            "brackets": data["brackets"],
+            "basic_personal_amount": data["basic_personal_amount"],
+            "surtaxes": data.get("surtaxes"),
+            "credits": data.get("credits"),
+            "metadata": data.get("metadata", {})
+        }
+    
+    def _cpp_ei_fields(self, data: Dict[str, Any], year: int) -> Dict[str, Any]:
+        """CPPEIData fields from JSON, with the set's year."""
+        return {
+            "year": year,
+            "cpp_rate": data["cpp_rate"],
+            "cpp_ympe": data["cpp_ympe"],
+            "cpp_basic_exemption": data["cpp_basic_exemption"],
+            "cpp_max_contrib": data["cpp_max_contrib"],
+            "ei_rate": data["ei_rate"],
+            "ei_mie": data["ei_mie"],
+            "ei_max_contrib": data["ei_max_contrib"],
+            "qpp_rate": data.get("qpp_rate"),
+            "qpp_ympe": data.get("qpp_ympe"),
+            "qpp_max_contrib": data.get("qpp_max_contrib"),
+            "qpip_rate": data.get("qpip_rate"),
+            "qpip_max_contrib": data.get("qpip_max_contrib")
+        }
     
     def _serialize_to_dict(self, tax_tables: TaxTableSet) -> Dict[str, Any]:
         """Serialize TaxTableSet to dictionary for JSON export."""
         return {
             "year": tax_tables.year,
-            "federal": {
-                "year": tax_tables.federal.year,
-                "jurisdiction": tax_tables.federal.jurisdiction,
-                "brackets": [
-                    {"threshold": b.threshold, "rate": b.rate}
-                    for b in tax_tables.federal.brackets
-                ],
-                "basic_personal_amount": tax_tables.federal.basic_personal_amount,
-                "surtaxes": tax_tables.federal.surtaxes,
-                "credits": tax_tables.federal.credits,
-                "metadata": tax_tables.federal.metadata
-            },
+            "federal": self._serialize_jurisdiction_data(tax_tables.federal),
             "provincial": {
-                province_code: {
-                    "year": data.year,
-                    "jurisdiction": data.jurisdiction,
-                    "brackets": [
-                        {"threshold": b.threshold, "rate": b.rate}
-                        for b in data.brackets
-                    ],
-                    "basic_personal_amount": data.basic_personal_amount,
-                    "surtaxes": data.surtaxes,
-                    "credits": data.credits,
-                    "metadata": data.metadata
-                }
+                province_code: self._serialize_jurisdiction_data(data)
                 for province_code, data in tax_tables.provincial.items()
             },
-            "cpp_ei": {
-                "year": tax_tables.cpp_ei.year,
-                "cpp_rate": tax_tables.cpp_ei.cpp_rate,
-                "cpp_ympe": tax_tables.cpp_ei.cpp_ympe,
-                "cpp_basic_exemption": tax_tables.cpp_ei.cpp_basic_exemption,
-                "cpp_max_contrib": tax_tables.cpp_ei.cpp_max_contrib,
-                "ei_rate": tax_tables.cpp_ei.ei_rate,
-                "ei_mie": tax_tables.cpp_ei.ei_mie,
-                "ei_max_contrib": tax_tables.cpp_ei.ei_max_contrib,
-                "qpp_rate": tax_tables.cpp_ei.qpp_rate,
-                "qpp_ympe": tax_tables.cpp_ei.qpp_ympe,
-                "qpp_max_contrib": tax_tables.cpp_ei.qpp_max_contrib,
-                "qpip_rate": tax_tables.cpp_ei.qpip_rate,
-                "qpip_max_contrib": tax_tables.cpp_ei.qpip_max_contrib
-            },
-            "metadata": tax_tables.metadata
+            "cpp_ei": self._serialize_cpp_ei_data(tax_tables.cpp_ei),
+            # Copied so callers can update the dict without touching shared (cached) tables
+            "metadata": dict(tax_tables.metadata)
         }
+    
+    # The serializers below copy each model's __dict__, where pydantic keeps
+    # exactly the declared fields in declaration order; one C-level dict copy
+    # per model in place of spelling out every field
+    
+    def _serialize_jurisdiction_data(self, data: JurisdictionTaxData) -> Dict[str, Any]:
+        """Serialize jurisdiction tax data to dictionary for JSON export."""
+        serialized = data.__dict__.copy()
+        serialized["brackets"] = [b.__dict__.copy() for b in data.brackets]
+        return serialized
+    
+    def _serialize_cpp_ei_data(self, cpp_ei: CPPEIData) -> Dict[str, Any]:
+        """Serialize CPP/EI data to dictionary for JSON export."""
+        return cpp_ei.__dict__.copy()
 
 
 class TableUpdater:
     """Utility for updating tax tables from official sources."""
     
+    # Top-level sections merge_updates merges dict updates into
+    MERGEABLE_SECTIONS = ("federal", "provincial", "cpp_ei", "metadata")
+    
     def __init__(self, loader: TaxTableLoader):
         self.loader = loader
     
@@ -334,6 +451,48 @@ class TableUpdater:
         Returns:
             Updated TaxTableSet
         """
+        # A new year is stamped onto every jurisdiction, and non-dict values
+        # replace whole sections; both take the full round trip
+        if "year" in updates or any(
+            key in self.MERGEABLE_SECTIONS and not isinstance(value, dict)
+            for key, value in updates.items()
+        ):
+            return self._merge_by_round_trip(existing, updates)
+        
+        # Only sections named in updates are reparsed; the rest are shared with existing
+        year = existing.year
+        federal = existing.federal
+        if "federal" in updates:
+            federal = self.loader._parse_jurisdiction_data(
+                {**self.loader._serialize_jurisdiction_data(federal), **updates["federal"]}, year, "federal"
+            )
+        
+        provincial = existing.provincial
+        if "provincial" in updates:
+            provincial = {**provincial}
+            for province_code, prov_data in updates["provincial"].items():
+                provincial[province_code] = self.loader._parse_jurisdiction_data(prov_data, year, province_code)
+        
+        cpp_ei = existing.cpp_ei
+        if "cpp_ei" in updates:
+            cpp_ei = self.loader._parse_cpp_ei_data(
+                {**self.loader._serialize_cpp_ei_data(cpp_ei), **updates["cpp_ei"]}, year
+            )
+        
+        metadata = existing.metadata
+        if "metadata" in updates:
+            metadata = {**metadata, **updates["metadata"]}
+        
+        return TaxTableSet(
+            year=year,
+            federal=federal,
+            provincial=provincial,
+            cpp_ei=cpp_ei,
+            metadata=metadata
+        )
+    
+    def _merge_by_round_trip(self, existing: TaxTableSet, updates: Dict[str, Any]) -> TaxTableSet:
+        """Merge updates by serializing existing, updating the dict and parsing it back."""
         # Create a deep copy of the existing data
         # (simplified - in reality you'd use copy.deepcopy or reconstruct)
         updated_data = self.loader._serialize_to_dict(existing)
@@ -1,10 +1,11 @@
 """
 Tax data models for Canadian federal and provincial tax calculations.
 """
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import date
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 from enum import Enum
+import numpy as np
 
 
 class Province(str, Enum):
@@ -32,16 +33,14 @@ class PaySchedule(str, Enum):
     MONTHLY = "monthly"
 
 
+# Jurisdiction codes tax data can be keyed by
+_VALID_JURISDICTIONS = frozenset(['federal'] + [p.value for p in Province])
+
+
 class TaxBracket(BaseModel):
     """A single tax bracket with threshold and marginal rate."""
-    threshold: float = Field(..., description="Income threshold for this bracket")
+    threshold: float = Field(..., ge=0, description="Income threshold for this bracket (non-negative)")
     rate: float = Field(..., ge=0, le=1, description="Marginal tax rate (0.0 to 1.0)")
-    
-    @validator('threshold')
-    def threshold_must_be_positive(cls, v):
-        if v < 0:
-            raise ValueError('Threshold must be non-negative')
-        return v
 
 
 class CPPEIData(BaseModel):
@@ -74,19 +73,33 @@ class JurisdictionTaxData(BaseModel):
     credits: Optional[Dict[str, float]] = Field(None, description="Tax credits available")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Source, citation, notes")
     
-    @validator('brackets')
+    @field_validator('brackets')
+    @classmethod
     def brackets_must_be_sorted(cls, v):
         thresholds = [b.threshold for b in v]
         if thresholds != sorted(thresholds):
             raise ValueError('Brackets must be sorted by threshold')
         return v
     
-    @validator('jurisdiction')
+    @field_validator('jurisdiction')
+    @classmethod
     def jurisdiction_must_be_valid(cls, v):
-        valid = ['federal'] + [p.value for p in Province]
-        if v not in valid:
+        if v not in _VALID_JURISDICTIONS:
+            valid = ['federal'] + [p.value for p in Province]
             raise ValueError(f'Jurisdiction must be one of: {valid}')
         return v
+    
+    def bracket_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bracket thresholds and rates as parallel float64 arrays.
+        
+        Built on each call rather than cached on the model, since arrays would
+        break model equality and go stale on copy(update=...).
+        """
+        count = len(self.brackets)
+        thresholds = np.fromiter((b.threshold for b in self.brackets), dtype=np.float64, count=count)
+        rates = np.fromiter((b.rate for b in self.brackets), dtype=np.float64, count=count)
+        return thresholds, rates
 
 
 class TaxTableSet(BaseModel):
@@ -115,8 +128,8 @@ class TaxCalculationResult(BaseModel):
     per_pay_period: Dict[str, float] = Field(default_factory=dict)
     
     # Detailed bracket breakdown
-    federal_breakdown: List[Dict[str, float]] = Field(default_factory=list)
-    provincial_breakdown: List[Dict[str, float]] = Field(default_factory=list)
+    federal_breakdown: List[Dict[str, Optional[float]]] = Field(default_factory=list)
+    provincial_breakdown: List[Dict[str, Optional[float]]] = Field(default_factory=list)
 
 
 class IncomeStream(BaseModel):
@@ -11,6 +11,11 @@ load_dotenv()
 
 def test_complete_setup():
     """Test the complete Supabase setup."""
+    # Under pytest the network checks are opt-in; running this script is itself the opt-in
+    if "pytest" in sys.modules and os.getenv("SUPABASE_LIVE") != "1":
+        import pytest
+        pytest.skip("set SUPABASE_LIVE=1 to run network test")
+    
     print("🔧 COMPLETE SUPABASE SETUP TEST")
     print("=" * 50)
     
@@ -64,7 +69,17 @@ def test_complete_setup():
             tables_to_check = ['users', 'budget_profiles', 'envelopes', 'bills', 'debts', 
                              'sinking_funds', 'savings_goals', 'budget_settings']
             
+            # One metadata request covers every table; only the ones it
+            # doesn't list get the slower per-table check for the error message
+            try:
+                existing = supabase_client.list_tables()
+            except Exception:
+                existing = set()
+            
             for table in tables_to_check:
+                if table in existing:
+                    print(f"   ✅ Table '{table}' exists")
+                    continue
                 try:
                     response = supabase_client.client.table(table).select("*").limit(1).execute()
                     print(f"   ✅ Table '{table}' exists")
@@ -4,17 +4,27 @@ Test script to verify Supabase connection.
 """
 import sys
 import os
-from dotenv import load_dotenv
-
-# Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-# Load environment variables
-load_dotenv()
 
 def test_supabase_connection():
     """Test the Supabase connection."""
     try:
+        # Load environment variables only when the check actually runs
+        from dotenv import load_dotenv
+        load_dotenv()
+        
+        # Without credentials there is nothing to connect to, so don't build the client
+        if not (os.getenv("SUPABASE_URL") and os.getenv("SUPABASE_KEY")):
+            if "pytest" in sys.modules:
+                import pytest
+                pytest.skip("Supabase creds missing")
+            print("❌ Missing environment variables!")
+            return False
+        
+        # Under pytest the network probe is opt-in; running this script is itself the opt-in
+        if "pytest" in sys.modules and os.getenv("SUPABASE_LIVE") != "1":
+            import pytest
+            pytest.skip("set SUPABASE_LIVE=1 to run network test")
+        
         from db.supabase_client import supabase_client
         
         if supabase_client is None:
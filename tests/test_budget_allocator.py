@@ -0,0 +1,205 @@
+"""
+Tests for the budget allocation module.
+"""
+import pytest
+from datetime import date, timedelta
+from budget.models import (
+    UserBudgetProfile, Envelope, Bill, Debt, SinkingFund,
+    EnvelopeCategory, BillType, DebtStrategy, BudgetSettings
+)
+from budget.allocator import PaycheckAllocator, ReconciliationEngine
+
+
+def _sample_profile(savings_rate: float = 0.0) -> UserBudgetProfile:
+    """Build a small profile with one envelope per allocation step."""
+    today = date.today()
+    return UserBudgetProfile(
+        envelopes=[
+            Envelope(id="rent", category=EnvelopeCategory.BILLS, name="Rent",
+                     target_amount=1500, current_balance=200, priority=1),
+            Envelope(id="card", category=EnvelopeCategory.DEBT, name="Credit Card",
+                     target_amount=150, priority=3),
+            Envelope(id="car", category=EnvelopeCategory.SINKING, name="Car Repair",
+                     target_amount=600, priority=4),
+            Envelope(id="tfsa", category=EnvelopeCategory.SAVINGS, name="TFSA",
+                     target_amount=3000, priority=5),
+            Envelope(id="rrsp", category=EnvelopeCategory.INVESTING, name="RRSP",
+                     target_amount=1000, priority=5),
+            Envelope(id="fun", category=EnvelopeCategory.DISCRETIONARY, name="Fun",
+                     target_amount=300, priority=10),
+        ],
+        bills=[
+            Bill(id="b1", name="Rent", amount=1500, bill_type=BillType.FIXED,
+                 envelope_id="rent", due_date=today + timedelta(days=3)),
+        ],
+        debts=[
+            Debt(id="d1", name="Credit Card", balance=4000, apr=0.1999,
+                 minimum_payment=150, due_date=today, envelope_id="card"),
+        ],
+        sinking_funds=[
+            SinkingFund(id="s1", name="Car Repair", target_amount=600,
+                        deadline=today + timedelta(days=65), envelope_id="car"),
+        ],
+        settings=BudgetSettings(savings_rate=savings_rate, round_to_nearest=0),
+    )
+
+
+def test_allocation_priority_order():
+    """Bills, debt minimums and sinking funds are funded before savings."""
+    profile = _sample_profile(savings_rate=0.1)
+    allocation = PaycheckAllocator(profile).allocate_paycheck(3000, date.today())
+
+    assert allocation.allocations["rent"] == pytest.approx(1300)
+    assert allocation.allocations["card"] >= 150
+    assert allocation.allocations["car"] == pytest.approx(
+        profile.sinking_funds[0].recommended_contribution
+    )
+
+    # Savings split proportionally to target amounts (3000:1000)
+    assert allocation.allocations["tfsa"] == pytest.approx(225)
+    assert allocation.allocations["rrsp"] == pytest.approx(75)
+
+    # Everything left over goes to extra debt payments
+    assert sum(allocation.allocations.values()) == pytest.approx(3000)
+    assert allocation.remaining_amount == pytest.approx(0)
+
+
+def test_allocation_stops_when_paycheck_runs_out():
+    """A short paycheck partially funds the first unmet need and stops."""
+    profile = _sample_profile(savings_rate=0.5)
+    allocation = PaycheckAllocator(profile).allocate_paycheck(1000, date.today())
+
+    assert allocation.allocations == {"rent": pytest.approx(1000)}
+    assert allocation.remaining_amount == pytest.approx(0)
+
+
+def test_leftover_goes_to_discretionary_without_debts():
+    """With no active debts the leftover lands in the discretionary envelope."""
+    profile = _sample_profile()
+    profile.debts[0].paid_off = True
+    allocation = PaycheckAllocator(profile).allocate_paycheck(2000, date.today())
+
+    assert "card" not in allocation.allocations
+    assert allocation.allocations["fun"] == pytest.approx(
+        2000 - allocation.allocations["rent"] - allocation.allocations["car"]
+    )
+
+
+def test_snowball_strategy_targets_smallest_balance():
+    """Extra debt payments follow the configured payoff strategy."""
+    profile = _sample_profile()
+    profile.envelopes.append(
+        Envelope(id="loan", category=EnvelopeCategory.DEBT, name="Loan",
+                 target_amount=50, current_balance=100, priority=3)
+    )
+    profile.debts.append(
+        Debt(id="d2", name="Loan", balance=900, apr=0.05, minimum_payment=50,
+             due_date=date.today(), envelope_id="loan")
+    )
+
+    profile.settings.debt_strategy = DebtStrategy.AVALANCHE
+    avalanche = PaycheckAllocator(profile).allocate_paycheck(5000, date.today())
+    assert "loan" not in avalanche.allocations
+
+    profile.settings.debt_strategy = DebtStrategy.SNOWBALL
+    snowball = PaycheckAllocator(profile).allocate_paycheck(5000, date.today())
+    assert snowball.allocations["loan"] > 0
+
+
+def test_bills_due_before_tracks_profile_changes():
+    """The unpaid-bill index follows bills added, paid, removed, redated and replaced."""
+    today = date.today()
+    profile = _sample_profile()
+    cutoff = today + timedelta(days=14)
+    assert [b.id for b in profile.get_bills_due_before(cutoff)] == ["b1"]
+
+    profile.add_bill(Bill(id="b2", name="Phone", amount=60, bill_type=BillType.FIXED,
+                          envelope_id="rent", due_date=today + timedelta(days=1)))
+    profile.add_bill(Bill(id="b3", name="Gym", amount=40, bill_type=BillType.SUBSCRIPTION,
+                          envelope_id="rent", due_date=today + timedelta(days=20)))
+    assert [b.id for b in profile.get_bills_due_before(cutoff)] == ["b2", "b1"]
+    assert [b.id for b in profile.get_bills_due_between(today + timedelta(days=2), today + timedelta(days=20))] == ["b1", "b3"]
+
+    assert profile.mark_bill_paid("b1", today).paid_date == today
+    assert [b.id for b in profile.get_bills_due_before(cutoff)] == ["b2"]
+
+    assert profile.remove_bill("b2").id == "b2"
+    assert profile.get_bills_due_before(cutoff) == []
+    assert [b.id for b in profile.get_bills_due_before(cutoff + timedelta(days=30))] == ["b3"]
+
+    profile.reschedule_bill("b3", today + timedelta(days=2))
+    assert [b.id for b in profile.get_bills_due_before(cutoff)] == ["b3"]
+
+    profile.bills = [Bill(id="b4", name="Water", amount=30, bill_type=BillType.FIXED,
+                          envelope_id="rent", due_date=today + timedelta(days=40))]
+    assert profile.get_bills_due_before(cutoff) == []
+    assert [b.id for b in profile.get_bills_due_before(cutoff + timedelta(days=30))] == ["b4"]
+
+
+def test_reused_allocator_follows_profile_changes():
+    """A reused allocator picks up envelopes added, edited or replaced after its first paycheck."""
+    profile = _sample_profile(savings_rate=0.1)
+    allocator = PaycheckAllocator(profile)
+    first = allocator.allocate_paycheck(3000, date.today())
+    assert "hisa" not in first.allocations
+
+    profile.envelopes.append(
+        Envelope(id="hisa", category=EnvelopeCategory.SAVINGS, name="HISA",
+                 target_amount=4000, priority=5)
+    )
+    second = allocator.allocate_paycheck(3000, date.today())
+    assert second.allocations["hisa"] == pytest.approx(150)
+
+    profile.envelopes[-1].target_amount = 0
+    third = allocator.allocate_paycheck(3000, date.today())
+    assert third.allocations["tfsa"] == pytest.approx(225)
+
+    profile.envelopes[-1] = Envelope(id="hisa", category=EnvelopeCategory.SAVINGS,
+                                     name="HISA", target_amount=1000, priority=5)
+    fourth = allocator.allocate_paycheck(3000, date.today())
+    assert fourth.allocations["hisa"] == pytest.approx(60)
+
+
+def test_envelopes_by_category_keeps_profile_order():
+    """Category lookups return envelopes in profile order and follow in-place edits."""
+    profile = _sample_profile()
+    savings = (EnvelopeCategory.SAVINGS, EnvelopeCategory.INVESTING)
+    assert [e.id for e in profile.get_envelopes_by_category(*savings)] == ["tfsa", "rrsp"]
+
+    profile.envelopes.insert(0, Envelope(id="hisa", category=EnvelopeCategory.SAVINGS,
+                                         name="HISA", target_amount=4000, priority=5))
+    assert [e.id for e in profile.get_envelopes_by_category(*savings)] == ["hisa", "tfsa", "rrsp"]
+
+    profile.envelopes[0].category = EnvelopeCategory.DISCRETIONARY
+    assert [e.id for e in profile.get_envelopes_by_category(EnvelopeCategory.DISCRETIONARY)] == ["hisa", "fun"]
+
+    profile.envelopes[4] = Envelope(id="bonds", category=EnvelopeCategory.INVESTING,
+                                    name="Bonds", target_amount=500, priority=5)
+    assert [e.id for e in profile.get_envelopes_by_category(*savings)] == ["bonds", "rrsp"]
+
+
+def test_adjust_allocation_leaves_source_profile_untouched():
+    """Adjusted targets land on copies; unchanged envelopes are shared."""
+    profile = _sample_profile()
+    engine = ReconciliationEngine()
+    results = engine.reconcile(profile, date.today(), date.today(), [
+        {"envelope_id": "fun", "amount": -600},
+    ])
+    updated = engine.adjust_allocation(profile, [r for r in results if r.envelope_id == "fun"])
+
+    assert profile.get_envelope("fun").target_amount == 300
+    assert updated.get_envelope("fun").target_amount == pytest.approx(330)
+    assert updated.get_envelope("rent") is profile.get_envelope("rent")
+
+
+def test_balance_snapshot_follows_replaced_envelopes():
+    """Replacing an envelope in place reports the new envelope's own balance."""
+    profile = _sample_profile()
+    profile.envelope_balance_snapshot()
+    profile.envelopes[0] = Envelope(id="rent2", category=EnvelopeCategory.BILLS, name="Rent",
+                                    target_amount=1500, current_balance=99, priority=1)
+
+    snapshot = profile.envelope_balance_snapshot()
+    assert snapshot["rent2"] == 99
+    assert "rent" not in snapshot
+    assert snapshot["card"] == 0
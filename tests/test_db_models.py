@@ -0,0 +1,380 @@
+"""
+Tests for the database models and helpers.
+"""
+import uuid
+import pytest
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import event
+from db.models import (
+    Base, Database, User, Envelope, Bill, BillOccurrence, PaychequeWindow, Transaction,
+    Paycheck, PaycheckExtras, TaxTable,
+    ProvinceEnum, EnvelopeCategoryEnum, BillTypeEnum
+)
+from db.queries import (
+    load_user_full, load_transaction_tree, get_tax_table, mark_bills_paid,
+    envelopes_for_user, unpaid_bills_for_user, transactions_between
+)
+
+
+@pytest.fixture(scope="session")
+def _database():
+    """One in-memory database for the run, so the schema DDL runs once."""
+    database = Database("sqlite://")
+    database.init_db()
+    yield database
+    database.engine.dispose()
+
+
+@pytest.fixture
+def db(_database):
+    """The shared database, emptied again after each test."""
+    yield _database
+    with _database.engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    # Rows went away behind the ORM's back, so drop anything cached from them
+    get_tax_table.cache_clear()
+
+
+def test_bulk_insert_batches_generated_rows(db):
+    """bulk_insert consumes a generator in chunks and applies column defaults."""
+    with db.session_scope() as session:
+        user = User(email="bulk@example.com", username="bulk", hashed_password="x",
+                    province=ProvinceEnum.ON)
+        envelope = Envelope(user=user, category=EnvelopeCategoryEnum.DISCRETIONARY, name="Fun")
+        session.add_all([user, envelope])
+        session.flush()
+        user_id, envelope_id = user.id, envelope.id
+
+    start = date(2024, 1, 1)
+    rows = (
+        {"user_id": user_id, "envelope_id": envelope_id, "date": start + timedelta(days=i),
+         "amount": Decimal("-12.50"), "description": f"Coffee {i}", "transaction_type": "expense"}
+        for i in range(25)
+    )
+    assert db.bulk_insert(Transaction, rows, batch_size=10) == 25
+
+    with db.session_scope() as session:
+        transactions = session.query(Transaction).order_by(Transaction.date).all()
+        assert len(transactions) == 25
+        assert len({t.id for t in transactions}) == 25
+        assert transactions[-1].description == "Coffee 24"
+        assert transactions[0].meta_data == {}
+
+
+def test_bulk_insert_converts_dollar_properties(db):
+    """Dollar-named keys land in their cents columns; unknown keys are rejected."""
+    with db.session_scope() as session:
+        user = User(email="dollars@example.com", username="dollars", hashed_password="x",
+                    province=ProvinceEnum.ON)
+        session.add(user)
+        session.flush()
+        user_id = user.id
+
+    db.bulk_insert(Envelope, [{"user_id": user_id, "category": "savings", "name": "TFSA",
+                               "current_balance": Decimal("5.005")}])
+    db.bulk_insert(PaychequeWindow, [{"user_id": user_id, "start_date": date(2024, 3, 1),
+                                      "end_date": date(2024, 3, 14), "total_allocated": 12.5}])
+
+    with db.session_scope() as session:
+        assert session.query(Envelope).one().current_balance == Decimal("5.01")
+        assert session.query(PaychequeWindow).one().total_allocated == Decimal("12.50")
+
+    with pytest.raises(ValueError, match="bogus"):
+        db.bulk_insert(Envelope, [{"user_id": user_id, "category": "savings", "name": "X",
+                                   "bogus": 1}])
+
+
+def test_string_ids_are_accepted(db):
+    """IDs passed as strings are parsed into UUIDs for writes and lookups."""
+    user_id = str(uuid.uuid4())
+    db.bulk_insert(User, [{"id": user_id, "email": "str@example.com", "username": "str",
+                           "hashed_password": "x", "province": "NS"}])
+    db.bulk_insert(Envelope, [{"user_id": user_id, "category": "bills", "name": "Rent"}])
+
+    with db.session_scope() as session:
+        assert session.get(User, user_id).id == uuid.UUID(user_id)
+        assert [e.name for e in envelopes_for_user(session, user_id)] == ["Rent"]
+
+
+def test_session_scope_rolls_back_on_error(db):
+    """A failing block leaves nothing behind; add_all_batched commits everything."""
+    with pytest.raises(RuntimeError):
+        with db.session_scope() as session:
+            session.add(User(email="gone@example.com", username="gone",
+                             hashed_password="x", province=ProvinceEnum.MB))
+            session.flush()
+            raise RuntimeError("boom")
+
+    users = (
+        User(email=f"user{i}@example.com", username=f"user{i}", hashed_password="x",
+             province=ProvinceEnum.NS)
+        for i in range(7)
+    )
+    assert db.add_all_batched(users, batch_size=3) == 7
+
+    with db.session_scope() as session:
+        assert sorted(u.username for u in session.query(User)) == [f"user{i}" for i in range(7)]
+
+
+def test_enum_columns_store_validated_values():
+    """Enum-backed columns accept members or values and reject unknown values."""
+    envelope = Envelope(category=EnvelopeCategoryEnum.SAVINGS, name="TFSA")
+    assert envelope.category == "savings"
+    assert Bill(bill_type="subscription").bill_type == "subscription"
+
+    with pytest.raises(ValueError):
+        Envelope(category="groceries", name="Food")
+    with pytest.raises(ValueError):
+        User(province="XX")
+
+
+def test_running_balances_are_stored_as_cents(db):
+    """Cents-backed columns round on write and read back as Decimal dollars."""
+    with db.session_scope() as session:
+        user = User(email="cents@example.com", username="cents", hashed_password="x",
+                    province=ProvinceEnum.QC)
+        envelope = Envelope(user=user, category=EnvelopeCategoryEnum.SAVINGS, name="TFSA")
+        envelope.current_balance = 19.995
+        session.add(user)
+        session.flush()
+        assert envelope.current_balance_cents == 2000
+        assert envelope.current_balance == Decimal("20.00")
+
+        rich = session.query(Envelope).filter(Envelope.current_balance > 10).all()
+        assert rich == [envelope]
+
+
+def test_paycheque_window_total_bills_sums_occurrences(db):
+    """total_bills is computed from the window's bill occurrences."""
+    with db.session_scope() as session:
+        user = User(email="window@example.com", username="window", hashed_password="x",
+                    province=ProvinceEnum.AB)
+        envelope = Envelope(user=user, category=EnvelopeCategoryEnum.BILLS, name="Bills")
+        bill = Bill(user=user, envelope=envelope, name="Phone", amount=Decimal("60"),
+                    bill_type=BillTypeEnum.FIXED, due_date=date(2024, 3, 5))
+        window = PaychequeWindow(user=user, start_date=date(2024, 3, 1), end_date=date(2024, 3, 14))
+        empty = PaychequeWindow(user=user, start_date=date(2024, 3, 15), end_date=date(2024, 3, 28))
+        for amount in ("60.00", "45.50"):
+            window.bill_occurrences.append(BillOccurrence(
+                user=user, bill=bill, amount=Decimal(amount), due_date=date(2024, 3, 5)))
+        session.add_all([user, empty])
+        session.flush()
+        window_id, empty_id = window.id, empty.id
+
+    with db.session_scope() as session:
+        assert session.get(PaychequeWindow, window_id).total_bills == Decimal("105.50")
+        assert session.get(PaychequeWindow, empty_id).total_bills == 0
+
+
+def test_paycheck_json_lives_in_extras_table(db):
+    """Paycheck JSON fields round-trip through the side table on both write paths."""
+    amounts = dict(gross_amount=Decimal("3000"), net_amount=Decimal("2200"),
+                   federal_tax=Decimal("400"), provincial_tax=Decimal("200"),
+                   cpp_contribution=Decimal("150"), ei_contribution=Decimal("50"))
+
+    with db.session_scope() as session:
+        user = User(email="pay@example.com", username="pay", hashed_password="x",
+                    province=ProvinceEnum.NB)
+        paycheck = Paycheck(user=user, date=date(2024, 5, 1), allocations={"rent": 1500.0},
+                            **amounts)
+        session.add(paycheck)
+        session.flush()
+        user_id, paycheck_id = user.id, paycheck.id
+
+    db.bulk_insert(Paycheck, [dict(user_id=user_id, date=date(2024, 5, 15),
+                                   other_deductions={"union": 25.0}, **amounts)])
+
+    with db.session_scope() as session:
+        assert session.query(PaycheckExtras).count() == 2
+        first, second = session.query(Paycheck).order_by(Paycheck.date).all()
+        assert first.id == paycheck_id
+        assert first.allocations == {"rent": 1500.0}
+        assert first.other_deductions == {}
+        assert second.other_deductions == {"union": 25.0}
+        assert second.allocations == {}
+
+
+def test_load_user_full_eager_loads_dashboard_collections(db):
+    """load_user_full populates nested collections without lazy loads."""
+    with db.session_scope() as session:
+        user = User(email="eager@example.com", username="eager", hashed_password="x",
+                    province=ProvinceEnum.BC)
+        rent = Envelope(user=user, category=EnvelopeCategoryEnum.BILLS, name="Rent")
+        rent.bills.append(Bill(user=user, name="Rent", amount=Decimal("1500"),
+                               bill_type=BillTypeEnum.FIXED, due_date=date(2024, 2, 1)))
+        session.add(user)
+        session.flush()
+        user_id = user.id
+
+    with db.session_scope() as session:
+        loaded = load_user_full(session, user_id)
+        session.expunge(loaded)  # Any lazy load from here on would raise
+
+        assert [e.name for e in loaded.envelopes] == ["Rent"]
+        assert [b.name for b in loaded.envelopes[0].bills] == ["Rent"]
+        assert loaded.debts == []
+        assert loaded.paycheque_windows == []
+        assert load_user_full(session, uuid.uuid4()) is None
+
+
+def test_load_transaction_tree_fetches_nested_splits(db):
+    """The whole split tree comes back in one query with splits populated."""
+    def txn(user, description, parent=None):
+        return Transaction(user=user, date=date(2024, 4, 1), amount=Decimal("-10"),
+                           description=description, transaction_type="expense", parent=parent)
+
+    with db.session_scope() as session:
+        user = User(email="tree@example.com", username="tree", hashed_password="x",
+                    province=ProvinceEnum.SK)
+        root = txn(user, "Costco")
+        food = txn(user, "Food", root)
+        session.add_all([root, food, txn(user, "Household", root), txn(user, "Snacks", food),
+                         txn(user, "Unrelated")])
+        session.flush()
+        root_id = root.id
+
+    with db.session_scope() as session:
+        loaded = load_transaction_tree(session, root_id)
+        session.expunge_all()  # Any lazy load from here on would raise
+
+        assert sorted(t.description for t in loaded.splits) == ["Food", "Household"]
+        food = next(t for t in loaded.splits if t.description == "Food")
+        assert [t.description for t in food.splits] == ["Snacks"]
+        assert food.splits[0].parent is food
+        assert load_transaction_tree(session, uuid.uuid4()) is None
+
+
+def test_get_tax_table_caches_until_written(db):
+    """Tax table lookups are cached and refreshed after ORM writes."""
+    get_tax_table.cache_clear()
+
+    with db.session_scope() as session:
+        session.add(TaxTable(year=2024, jurisdiction="ON", data={"brackets": [1]}))
+
+    assert get_tax_table(2024, "ON", db) == {"brackets": [1]}
+    assert get_tax_table(2024, "ON", db) is get_tax_table(2024, "ON", db)
+    assert get_tax_table(2024, "BC", db) is None
+
+    with db.session_scope() as session:
+        session.query(TaxTable).one().data = {"brackets": [2]}
+
+    assert get_tax_table(2024, "ON", db) == {"brackets": [2]}
+
+
+def test_get_tax_table_cache_clears_on_commit_not_flush(tmp_path):
+    """A read between flush and commit can't leave the old row cached."""
+    database = Database(f"sqlite:///{tmp_path / 'tax.db'}")
+    database.init_db()
+    get_tax_table.cache_clear()
+    try:
+        with database.session_scope() as session:
+            session.add(TaxTable(year=2024, jurisdiction="ON", data={"brackets": [1]}))
+
+        with database.session_scope() as session:
+            session.query(TaxTable).one().data = {"brackets": [2]}
+            session.flush()
+            # Another connection still sees the committed row and caches it
+            assert get_tax_table(2024, "ON", database) == {"brackets": [1]}
+
+        assert get_tax_table(2024, "ON", database) == {"brackets": [2]}
+    finally:
+        get_tax_table.cache_clear()
+        database.engine.dispose()
+
+
+def test_upsert_tax_tables_replaces_existing_rows(db):
+    """Upserting keeps one row per (year, jurisdiction) and refreshes the cache."""
+    assert db.upsert_tax_tables([
+        {"year": 2024, "jurisdiction": "federal", "data": {"v": 1}},
+        {"year": 2024, "jurisdiction": "ON", "data": {"v": 1}, "source": "CRA"},
+    ]) == 2
+    assert get_tax_table(2024, "ON", db) == {"v": 1}
+
+    db.upsert_tax_tables([{"year": 2024, "jurisdiction": "ON", "data": {"v": 2}}])
+
+    with db.session_scope() as session:
+        assert session.query(TaxTable).count() == 2
+    assert get_tax_table(2024, "ON", db) == {"v": 2}
+
+
+def test_deleting_user_cascades_in_the_database(db):
+    """Deleting a user is one DELETE; the database removes the children."""
+    with db.session_scope() as session:
+        user = User(email="gone@example.com", username="gone", hashed_password="x",
+                    province=ProvinceEnum.PE)
+        envelope = Envelope(user=user, category=EnvelopeCategoryEnum.BILLS, name="Bills")
+        envelope.bills.append(Bill(user=user, name="Hydro", amount=Decimal("80"),
+                                   bill_type=BillTypeEnum.VARIABLE, due_date=date(2024, 6, 1)))
+        session.add(user)
+        session.flush()
+        user_id = user.id
+
+    statements = []
+    def record(conn, cursor, sql, *args):
+        statements.append(sql)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        with db.session_scope() as session:
+            session.delete(session.get(User, user_id))
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    assert [sql.split()[0] for sql in statements] == ["SELECT", "DELETE"]
+    with db.session_scope() as session:
+        assert session.query(Envelope).count() == 0
+        assert session.query(Bill).count() == 0
+
+
+def test_mark_bills_paid_updates_only_given_occurrences(db):
+    """mark_bills_paid flips the selected occurrences in one statement."""
+    with db.session_scope() as session:
+        user = User(email="paid@example.com", username="paid", hashed_password="x",
+                    province=ProvinceEnum.NL)
+        envelope = Envelope(user=user, category=EnvelopeCategoryEnum.BILLS, name="Bills")
+        bill = Bill(user=user, envelope=envelope, name="Internet", amount=Decimal("70"),
+                    bill_type=BillTypeEnum.FIXED, due_date=date(2024, 7, 1))
+        window = PaychequeWindow(user=user, start_date=date(2024, 7, 1), end_date=date(2024, 7, 14))
+        occurrences = [BillOccurrence(user=user, bill=bill, paycheque_window=window,
+                                      amount=Decimal("70"), due_date=date(2024, 7, d))
+                       for d in (1, 2, 3)]
+        session.add_all(occurrences)
+        session.flush()
+        ids = [o.id for o in occurrences]
+
+    with db.session_scope() as session:
+        assert mark_bills_paid(session, ids[:2], date(2024, 7, 5)) == 2
+
+    with db.session_scope() as session:
+        rows = session.query(BillOccurrence).order_by(BillOccurrence.due_date).all()
+        assert [(o.paid, o.paid_date) for o in rows] == [
+            (True, date(2024, 7, 5)), (True, date(2024, 7, 5)), (False, None)
+        ]
+
+
+def test_cached_per_user_queries_bind_fresh_values(db):
+    """The lambda-cached reads return each caller's own rows."""
+    with db.session_scope() as session:
+        users = []
+        for name, due_day in (("ann", 3), ("bob", 9)):
+            user = User(email=f"{name}@example.com", username=name, hashed_password="x",
+                        province=ProvinceEnum.YT)
+            envelope = Envelope(user=user, category=EnvelopeCategoryEnum.BILLS, name=name)
+            envelope.bills.append(Bill(user=user, name=f"{name} rent", amount=Decimal("900"),
+                                       bill_type=BillTypeEnum.FIXED, due_date=date(2024, 8, due_day)))
+            envelope.bills.append(Bill(user=user, name=f"{name} old", amount=Decimal("900"), paid=True,
+                                       bill_type=BillTypeEnum.FIXED, due_date=date(2024, 7, due_day)))
+            session.add(Transaction(user=user, date=date(2024, 8, due_day), amount=Decimal("-5"),
+                                    description=f"{name} coffee", transaction_type="expense"))
+            users.append(user)
+        session.flush()
+        ann_id, bob_id = (u.id for u in users)
+
+    with db.session_scope() as session:
+        assert [e.name for e in envelopes_for_user(session, ann_id)] == ["ann"]
+        assert [e.name for e in envelopes_for_user(session, bob_id)] == ["bob"]
+        assert [b.name for b in unpaid_bills_for_user(session, bob_id)] == ["bob rent"]
+        assert [t.description for t in transactions_between(
+            session, ann_id, date(2024, 8, 1), date(2024, 8, 31))] == ["ann coffee"]
+        assert transactions_between(session, bob_id, date(2024, 8, 1), date(2024, 8, 5)) == []
@@ -0,0 +1,39 @@
+"""
+Tests for the Supabase row records.
+"""
+import pytest
+from dataclasses import FrozenInstanceError
+from datetime import date
+from db.records import DebtRecord, EnvelopeRecord, to_arrays, to_records
+
+
+def test_records_from_postgrest_rows():
+    """Rows convert to typed records, dropping columns the record doesn't carry."""
+    rows = [
+        {"id": "e1", "profile_id": "p1", "category": "BILLS", "name": "Rent",
+         "target_amount": 1500, "current_balance": None, "priority": 1,
+         "created_at": "2024-01-01T00:00:00+00:00"},
+    ]
+    envelope, = to_records(EnvelopeRecord, rows)
+    assert envelope.target_amount == 1500.0
+    assert envelope.current_balance == 0.0
+    assert not hasattr(envelope, "__dict__")
+    
+    with pytest.raises(FrozenInstanceError):
+        envelope.name = "Mortgage"
+
+
+def test_record_arrays():
+    """Numeric columns come out as parallel arrays."""
+    debts = to_records(DebtRecord, [
+        {"id": f"d{i}", "profile_id": "p1", "envelope_id": None, "name": f"Debt {i}",
+         "balance": 1000 * i, "apr": 0.05 * i, "minimum_payment": 25,
+         "due_date": "2024-03-15", "strategy": "AVALANCHE"}
+        for i in (1, 2)
+    ])
+    assert debts[0].due_date == date(2024, 3, 15)
+    
+    arrays = to_arrays(debts)
+    assert set(arrays) == {"balance", "apr", "minimum_payment"}
+    assert arrays["balance"].tolist() == [1000.0, 2000.0]
+    assert to_arrays(debts, "id")["id"].tolist() == ["d1", "d2"]
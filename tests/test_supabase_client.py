@@ -0,0 +1,272 @@
+"""
+Tests for the Supabase client wrapper, against fake sessions.
+"""
+import asyncio
+import json
+import threading
+import time
+import pytest
+from datetime import date
+from types import SimpleNamespace
+
+httpx = pytest.importorskip("httpx")
+supabase = pytest.importorskip("supabase")
+
+from db import supabase_client as module
+
+
+class FakeAsyncClient:
+    """Stands in for supabase's AsyncClient, which only works on the loop that made it."""
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+
+    def table(self, name):
+        return self
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    async def execute(self):
+        assert asyncio.get_running_loop() is self.loop, "client used on another event loop"
+        return SimpleNamespace(data=[{"id": "e1"}])
+
+
+class FakeResponse:
+    """Just enough of an httpx response for the wrapper's raw PostgREST calls."""
+
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode()
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    """PostgREST HTTP session serving canned rows and recording requests."""
+
+    def __init__(self):
+        self.gets = []
+        self.posts = []
+        self.rows = [{"id": "r1"}]
+        self.gate = None
+        self.started = threading.Event()
+        self.error = None
+
+    def get(self, path):
+        self.gets.append(path)
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.error is not None:
+            raise self.error
+        return FakeResponse(self.rows)
+
+    def post(self, path, content, headers):
+        rows = json.loads(content)
+        self.posts.append((path, rows))
+        return FakeResponse([{"id": f"new{len(self.posts)}-{i}", **row} for i, row in enumerate(rows)])
+
+    def close(self):
+        pass
+
+
+class FakeQuery:
+    """Query builder for writes; every call chains and execute records the write."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+
+    def update(self, data):
+        return self
+
+    def delete(self):
+        return self
+
+    def eq(self, column, value):
+        return self
+
+    def execute(self):
+        self.client.writes.append(self.table)
+        return SimpleNamespace(data=[])
+
+
+class FakeSyncClient:
+    """Stands in for supabase's Client, which rebuilds PostgREST lazily after auth changes."""
+
+    def __init__(self):
+        self._postgrest = None
+        self.writes = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    @staticmethod
+    def _init_postgrest_client(rest_url):
+        return SimpleNamespace(session=httpx.Client(base_url=rest_url))
+
+    @property
+    def postgrest(self):
+        if self._postgrest is None:
+            self._postgrest = self._init_postgrest_client("https://example.supabase.co/rest/v1")
+        return self._postgrest
+
+    def sign_in(self):
+        """What supabase-py does on SIGNED_IN and TOKEN_REFRESHED."""
+        self._postgrest = None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A SupabaseClient wired to fakes instead of a live project."""
+    monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+    monkeypatch.setenv("SUPABASE_KEY", "key")
+    monkeypatch.setattr(module, "create_client", lambda url, key: FakeSyncClient())
+
+    created = []
+
+    async def fake_acreate_client(url, key):
+        created.append(FakeAsyncClient())
+        return created[-1]
+
+    monkeypatch.setattr(supabase, "acreate_client", fake_acreate_client, raising=False)
+    wrapper = module.SupabaseClient()
+    wrapper.created = created
+    yield wrapper
+    wrapper.client.postgrest.session.close()
+
+
+def test_async_reads_work_across_event_loops(client):
+    """Each asyncio.run gets its own async client instead of reusing a dead loop's."""
+    assert asyncio.run(client.aget_envelopes("p1")) == [{"id": "e1"}]
+    assert asyncio.run(client.aget_envelopes("p1")) == [{"id": "e1"}]
+    assert len(client.created) == 2
+
+
+def test_pooled_session_survives_sign_in(client):
+    """PostgREST clients rebuilt after an auth change get the pooled session too."""
+    first = client.client.postgrest
+    assert first._pooled_session is first.session
+
+    client.client.sign_in()
+    rebuilt = client.client.postgrest
+    assert rebuilt is not first
+    assert rebuilt._pooled_session is rebuilt.session
+
+
+@pytest.fixture
+def session(client):
+    """The fake HTTP session behind the client's PostgREST calls."""
+    fake = FakeSession()
+    client.client.postgrest.session.close()
+    client.client.postgrest.session = fake
+    return fake
+
+
+def test_select_eq_builds_filtered_paths(client, session):
+    """Filters become eq conditions, with booleans lowercased and values quoted."""
+    assert client.get_bills("p 1", paid=False) == [{"id": "r1"}]
+    assert session.gets == ["/bills?select=*&profile_id=eq.p%201&paid=eq.false"]
+
+
+def test_concurrent_identical_reads_share_one_request(client, session):
+    """A read already in flight is joined, not repeated."""
+    session.gate = threading.Event()
+    results = []
+    leader = threading.Thread(target=lambda: results.append(client.get_envelopes("p1")))
+    follower = threading.Thread(target=lambda: results.append(client.get_envelopes("p1")))
+    leader.start()
+    assert session.started.wait(5)
+    follower.start()
+    time.sleep(0.1)  # Let the follower find the leader's request
+    session.gate.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert session.gets == ["/envelopes?select=*&profile_id=eq.p1"]
+    assert results == [[{"id": "r1"}], [{"id": "r1"}]]
+    assert results[0] is not results[1]
+    assert client._inflight == {}
+
+
+def test_failed_read_reaches_every_waiter(client, session):
+    """Followers get the leader's exception, and the next read tries again."""
+    session.gate = threading.Event()
+    session.error = RuntimeError("boom")
+    errors = []
+
+    def read():
+        try:
+            client.get_envelopes("p1")
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=read)
+    follower = threading.Thread(target=read)
+    leader.start()
+    assert session.started.wait(5)
+    follower.start()
+    time.sleep(0.1)
+    session.gate.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert len(session.gets) == 1
+    assert len(errors) == 2 and errors[0] is errors[1]
+
+    session.gate = None
+    session.error = None
+    assert client.get_envelopes("p1") == [{"id": "r1"}]
+    assert len(session.gets) == 2
+
+
+def test_cached_lookups_expire_and_invalidate(client, session, monkeypatch):
+    """Lookups are reused until CACHE_TTL passes or a write drops them; misses aren't cached."""
+    clock = [1000.0]
+    monkeypatch.setattr(module, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    profile = client.get_budget_profile("p1")
+    assert client.get_budget_profile("p1") is profile
+    assert len(session.gets) == 1
+
+    clock[0] += client.CACHE_TTL + 1
+    client.get_budget_profile("p1")
+    assert len(session.gets) == 2
+
+    client.update_budget_profile("p1", {"name": "Renamed"})
+    client.get_budget_profile("p1")
+    assert len(session.gets) == 3
+
+    session.rows = []
+    assert client.get_budget_settings("p1") is None
+    assert client.get_budget_settings("p1") is None
+    assert len(session.gets) == 5
+
+
+def test_normalize_casts_and_fills_defaults():
+    """Rows are reduced to the table's insert columns, cast, with defaults filled in."""
+    assert module._normalize("bills", {"name": "Rent", "amount": "1500", "due_date": date(2024, 3, 1),
+                                       "extra": "dropped"}) == {
+        "envelope_id": None, "name": "Rent", "amount": 1500.0, "bill_type": None,
+        "due_date": "2024-03-01", "paid": False,
+    }
+    assert module._normalize("budget_settings", {"savings_rate": 0.1}) == {
+        "checking_buffer": 500.0, "emergency_fund_target": 10000.0, "debt_strategy": "AVALANCHE",
+        "savings_rate": 0.1, "discretionary_percentage": 0.3, "round_to_nearest": 10.0,
+    }
+
+
+def test_bulk_inserts_are_batched(client, session, monkeypatch):
+    """Bulk creates send BULK_INSERT_SIZE rows per request and return every created row."""
+    monkeypatch.setattr(client, "BULK_INSERT_SIZE", 2)
+    created = client.create_envelopes_bulk("p1", [{"name": f"E{i}", "category": "bills"} for i in range(5)])
+
+    assert [len(rows) for _, rows in session.posts] == [2, 2, 1]
+    assert {path for path, _ in session.posts} == {"/envelopes"}
+    assert [row["name"] for row in created] == [f"E{i}" for i in range(5)]
+    assert session.posts[0][1][0] == {"profile_id": "p1", "category": "bills", "name": "E0",
+                                      "target_amount": 0.0, "current_balance": 0.0, "priority": 10}